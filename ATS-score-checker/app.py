@@ -1,164 +1,303 @@
-import streamlit as st
-from modules import parser, scorer, llm_handler, utils
-import os
-from dotenv import load_dotenv
-
-# Load .env as fallback for API keys
-env_path = os.path.join(os.path.dirname(__file__), '.env')
-if os.path.exists(env_path):
-    load_dotenv(env_path)
-
-st.set_page_config(page_title="AI-Powered ATS Resume Shortlisting", page_icon="🧑‍💼", layout="wide")
-st.title("🤖 AI-Powered ATS Resume Shortlisting System")
-
-# Sidebar - API keys and LLM selection
-st.sidebar.header("🔐 API Keys & LLM Selection")
-llm_options = ["OpenAI gpt-3.5-turbo", "Groq (Mixtral)", "Gemini Pro"]
-llm_choice = st.sidebar.selectbox("Select LLM", llm_options, index=0)
-
-openai_key = st.sidebar.text_input("OpenAI API Key", value=os.getenv("OPENAI_API_KEY", ""), type="password")
-groq_key = st.sidebar.text_input("Groq API Key", value=os.getenv("GROQ_API_KEY", ""), type="password")
-gemini_key = st.sidebar.text_input("Gemini API Key", value=os.getenv("GEMINI_API_KEY", ""), type="password")
-
-st.sidebar.info("""
-- Enter your API keys above (these stay local!)
-- Select which LLM to use for matching
-- Upload resumes and paste the job description below
-""")
-
-# --- Sakshi Meena details ---
-st.sidebar.markdown("""
-<hr style='border:1px solid #444;margin:1.2em 0;'>
-<div style='text-align:center;'>
-    <span style='font-size:1.3em;font-weight:bold;color:#4e54c8;'>Sakshi Meena</span><br>
-     <a href='mailto:sakshimeena7357@gmail.com' target='_blank' style='margin:0 6px;'>
-        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/gmail.svg' width='28' height='28' alt='Gmail' style='vertical-align:middle;filter:invert(36%) sepia(83%) saturate(2083%) hue-rotate(346deg) brightness(97%) contrast(97%);'>
-    </a>
-     <a href='https://github.com/Sakshi-meena' target='_blank' style='margin:0 6px;'>
-        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/github.svg' width='28' height='28' alt='GitHub' style='vertical-align:middle;filter:invert(100%) grayscale(100%);'>
-    </a>
-    <a href='https://www.linkedin.com/in/sakshimeena' target='_blank' style='margin:0 6px;'>
-        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/linkedin.svg' width='28' height='28' alt='LinkedIn' style='vertical-align:middle;filter:invert(33%) sepia(95%) saturate(746%) hue-rotate(182deg) brightness(94%) contrast(91%);'>
-    </a>
-    <a href='https://x.com/SMeena73?t=_1qWs4p3ihHZbmb8R-9KOA&s=09' target='_blank' style='margin:0 6px;'>
-        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/x.svg' width='28' height='28' alt='Twitter (X)' style='vertical-align:middle;filter:invert(100%) grayscale(100%);'>
-    </a>
-    <br>
-    <span style='font-size:0.93em;color:#aaa;'>researcher@datafyassociates.com</span>
-</div>
-""", unsafe_allow_html=True)
-
-# Main app - Upload resumes and job description
-st.subheader("🧾 Upload Resumes (PDF/DOCX)")
-resume_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=False)
-
-st.subheader("📋 Paste Job Description")
-job_description = st.text_area("Enter the job description here", height=200)
-
-if st.button("Run ATS Evaluation"):
-    if not resume_file or not job_description.strip():
-        st.error("Please upload a resume and enter a job description.")
-    else:
-        import pandas as pd
-        st.subheader("🎯 ATS Results")
-        with st.spinner("Processing resume..."):
-            resume_text = parser.extract_text(resume_file)
-            ats_result = scorer.score_resume(
-                resume_text,
-                job_description,
-                llm_choice,
-                {"openai": openai_key, "groq": groq_key, "gemini": gemini_key}
-            )
-            ats_result["filename"] = resume_file.name
-        # Extract requirements and improved skill matching using NLTK
-        from modules.utils import match_skills
-        # Improved Job Requirements extraction
-        import re
-        job_lines = [line.strip() for line in job_description.splitlines() if line.strip()]
-        requirements = []
-        # Extract bullet points and lines with key verbs
-        for line in job_lines:
-            l = line.lower()
-            if (re.match(r'^[\-•*]', l) or
-                any(word in l for word in ["require", "must", "should", "responsible", "expect", "qualif", "need"])):
-                requirements.append(line)
-        # Extract lines under 'requirements', 'qualifications', 'responsibilities' sections
-        section_patterns = [r'requirements?', r'qualifications?', r'responsibilit(y|ies)']
-        for i, line in enumerate(job_lines):
-            for pat in section_patterns:
-                if re.match(pat, line, re.IGNORECASE):
-                    # Collect up to 10 lines after the section header
-                    for next_line in job_lines[i+1:i+11]:
-                        if next_line and not re.match(r'^[A-Z ]{4,}$', next_line):
-                            requirements.append(next_line)
-        # Deduplicate and filter
-        requirements = list(dict.fromkeys([r for r in requirements if len(r) > 4]))
-        if not requirements:
-            requirements = job_lines
-
-        jd_skills, resume_skills, matched_skills, missing_skills = match_skills(job_description, resume_text)
-
-        # Infographic: Interactive and modern visualizations with Plotly
-        import plotly.graph_objects as go
-        import plotly.express as px
-        col1, col2 = st.columns([2, 3])
-        with col1:
-            st.markdown(f"### 📝 {ats_result['filename']}")
-            st.markdown("#### Section Scores (Radar Chart)")
-            # Plotly radar/spider chart for section scores
-            categories = ["Education", "Skills", "Experience"]
-            scores = [ats_result["education_score"], ats_result["skills_score"], ats_result["experience_score"]]
-            radar_fig = go.Figure()
-            radar_fig.add_trace(go.Scatterpolar(r=scores + [scores[0]], theta=categories + [categories[0]], fill='toself', name='Section Score', line_color='#4e54c8'))
-            radar_fig.update_layout(
-                polar=dict(bgcolor='#262730', radialaxis=dict(visible=True, range=[0, 100], showticklabels=True, ticks=''), angularaxis=dict(linecolor='white', gridcolor='gray')),
-                showlegend=False, paper_bgcolor='#262730', font_color='white', margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='ATS Section Scores'
-            )
-            st.plotly_chart(radar_fig, use_container_width=True)
-            # Interactive bar chart for skill coverage
-            st.markdown("#### Skill Coverage (Bar Chart)")
-            skill_labels = ["Matched Skills", "Missing Skills"]
-            skill_counts = [len(matched_skills), len(missing_skills)]
-            bar_fig = px.bar(x=skill_counts, y=skill_labels, orientation='h', color=skill_labels, color_discrete_sequence=["#4CAF50", "#FF6666"], text=skill_counts)
-            bar_fig.update_layout(
-                xaxis_title='Count', yaxis_title='', plot_bgcolor='#262730', paper_bgcolor='#262730', font_color='white',
-                showlegend=False, margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='Skill Coverage'
-            )
-            bar_fig.update_traces(textposition='outside')
-            st.plotly_chart(bar_fig, use_container_width=True)
-            # Interactive pie chart for skill match
-            st.markdown("#### Skill Match Overview (Pie Chart)")
-            sizes = [len(matched_skills), len(missing_skills)]
-            labels = ['Matched', 'Missing']
-            if sum(sizes) > 0:
-                pie_fig = px.pie(values=sizes, names=labels, color=labels, color_discrete_map={'Matched':'#4CAF50','Missing':'#FF6666'}, hole=0.3)
-                pie_fig.update_traces(textinfo='percent+label', textfont_size=14)
-                pie_fig.update_layout(
-                    showlegend=True, legend_title_text='', paper_bgcolor='#262730', font_color='white',
-                    margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='Skill Match Overview'
-                )
-                st.plotly_chart(pie_fig, use_container_width=True)
-            else:
-                st.info('No required skills found in the job description. Pie chart not displayed.')
-        with col2:
-            st.markdown(f"<div style='background:linear-gradient(90deg,#4e54c8,#8f94fb);padding:1.5em 1em;border-radius:16px;margin-bottom:1em;'>"
-                        f"<span style='font-size:2em;font-weight:bold;color:white;'>Final Score: {ats_result['final_score']}/100</span>"
-                        f"<br><span style='color:white;font-size:1.1em;'>{ats_result['overall_explanation']}</span>"
-                        f"</div>", unsafe_allow_html=True)
-            st.markdown("#### Job Requirements")
-            for req in requirements:
-                st.markdown(f"- {req}")
-            st.markdown("#### Skills Overview")
-            st.markdown(f"<span style='color:#2196f3;font-weight:bold;'>Required (JD) Skills:</span> {', '.join(jd_skills) if jd_skills else 'None'}", unsafe_allow_html=True)
-            st.markdown(f"<span style='color:#ffa726;font-weight:bold;'>Skills Found in Resume:</span> {', '.join(resume_skills) if resume_skills else 'None'}", unsafe_allow_html=True)
-            st.markdown(f"<span style='color:lightgreen;font-weight:bold;'>Matched Skills:</span> {', '.join(matched_skills) if matched_skills else 'None'}", unsafe_allow_html=True)
-            st.markdown(f"<span style='color:#ff6666;font-weight:bold;'>Missing Skills:</span> {', '.join(missing_skills) if missing_skills else 'None'}", unsafe_allow_html=True)
-            st.markdown("#### Suggestions & Recommendations 🛠️")
-            st.markdown(f"- **Education:** {ats_result['education_suggestions']}")
-            st.markdown(f"- **Skills:** {ats_result['skills_suggestions']}")
-            st.markdown(f"- **Experience:** {ats_result['experience_suggestions']}")
-            st.markdown("#### Reasoning 🧠")
-            st.markdown(f"- **Education:** {ats_result['education_reasoning']}")
-            st.markdown(f"- **Skills:** {ats_result['skills_reasoning']}")
-            st.markdown(f"- **Experience:** {ats_result['experience_reasoning']}")
-
+import streamlit as st
+# The modules import openai, pypdf, docx2txt and numpy only when they are first used
+from modules import parser, scorer, llm_handler, utils, batch, cache, job_profile, telemetry
+import hashlib
+import importlib
+import os
+import threading
+from dotenv import load_dotenv
+
+# Load .env as fallback for API keys
+env_path = os.path.join(os.path.dirname(__file__), '.env')
+if os.path.exists(env_path):
+    load_dotenv(env_path)
+
+# Persist LLM responses across reruns and restarts unless a cache location is configured explicitly
+os.environ.setdefault("ATS_LLM_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "llm_cache.sqlite"))
+
+st.set_page_config(page_title="AI-Powered ATS Resume Shortlisting", page_icon="🧑‍💼", layout="wide")
+
+# Libraries an evaluation needs but the first page render does not
+PRELOAD_MODULES = ("openai", "pypdf", "docx2txt", "numpy", "pandas", "plotly.express", "plotly.graph_objects")
+
+@st.cache_resource(show_spinner=False)
+def preload_dependencies() -> threading.Thread:
+    """Import PRELOAD_MODULES once per process on a background thread, so the first click does not pay for them."""
+    def load():
+        for name in PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+    thread = threading.Thread(target=load, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def analyze_resume(content_hash: str, filename: str, job_description: str, _data: bytes):
+    """Extracted text and skill match of one upload, cached by file content hash and JD across reruns and sessions."""
+    resume_text = parser.extract_bytes(filename, _data)
+    return resume_text, utils.match_skills(job_profile.get_job_profile(job_description), resume_text)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def radar_figure(education: int, skills: int, experience: int):
+    import plotly.graph_objects as go
+    categories = ["Education", "Skills", "Experience"]
+    scores = [education, skills, experience]
+    radar_fig = go.Figure()
+    radar_fig.add_trace(go.Scatterpolar(r=scores + [scores[0]], theta=categories + [categories[0]], fill='toself', name='Section Score', line_color='#4e54c8'))
+    radar_fig.update_layout(
+        polar=dict(bgcolor='#262730', radialaxis=dict(visible=True, range=[0, 100], showticklabels=True, ticks=''), angularaxis=dict(linecolor='white', gridcolor='gray')),
+        showlegend=False, paper_bgcolor='#262730', font_color='white', margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='ATS Section Scores'
+    )
+    return radar_fig
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def skill_figures(n_matched: int, n_missing: int):
+    """Skill coverage bar chart and match pie chart (None when there is nothing to show)."""
+    import plotly.express as px
+    skill_labels = ["Matched Skills", "Missing Skills"]
+    skill_counts = [n_matched, n_missing]
+    bar_fig = px.bar(x=skill_counts, y=skill_labels, orientation='h', color=skill_labels, color_discrete_sequence=["#4CAF50", "#FF6666"], text=skill_counts)
+    bar_fig.update_layout(
+        xaxis_title='Count', yaxis_title='', plot_bgcolor='#262730', paper_bgcolor='#262730', font_color='white',
+        showlegend=False, margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='Skill Coverage'
+    )
+    bar_fig.update_traces(textposition='outside')
+    if n_matched + n_missing == 0:
+        return bar_fig, None
+    labels = ['Matched', 'Missing']
+    pie_fig = px.pie(values=skill_counts, names=labels, color=labels, color_discrete_map={'Matched':'#4CAF50','Missing':'#FF6666'}, hole=0.3)
+    pie_fig.update_traces(textinfo='percent+label', textfont_size=14)
+    pie_fig.update_layout(
+        showlegend=True, legend_title_text='', paper_bgcolor='#262730', font_color='white',
+        margin=dict(l=10, r=10, t=40, b=10), title_font_size=18, title_text='Skill Match Overview'
+    )
+    return bar_fig, pie_fig
+
+st.title("🤖 AI-Powered ATS Resume Shortlisting System")
+
+# Sidebar - API keys and LLM selection
+st.sidebar.header("🔐 API Keys & LLM Selection")
+llm_options = ["OpenAI gpt-3.5-turbo", "Groq (Llama 3.3)", "Gemini Pro", "Auto (fastest available)", "Local (no LLM)"]
+llm_choice = st.sidebar.selectbox("Select LLM", llm_options, index=0)
+
+openai_key = st.sidebar.text_input("OpenAI API Key", value=os.getenv("OPENAI_API_KEY", ""), type="password")
+groq_key = st.sidebar.text_input("Groq API Key", value=os.getenv("GROQ_API_KEY", ""), type="password")
+gemini_key = st.sidebar.text_input("Gemini API Key", value=os.getenv("GEMINI_API_KEY", ""), type="password")
+
+use_cache = st.sidebar.checkbox("Reuse cached LLM responses", value=True)
+max_workers = st.sidebar.slider("Concurrent LLM requests (batch mode)", min_value=1, max_value=32, value=batch.DEFAULT_CONCURRENCY)
+# Per session: only this visitor's runs are broken down (the process-wide exports are configured via ATS_TELEMETRY)
+record_timings = st.sidebar.checkbox("Record pipeline timings", value=telemetry.is_enabled())
+
+st.sidebar.info("""
+- Enter your API keys above (these stay local!)
+- Select which LLM to use for matching
+- Upload resumes and paste the job description below
+""")
+
+if llm_handler.provider_name(llm_choice) == "auto":
+    router = llm_handler.get_router({"openai": openai_key, "groq": groq_key, "gemini": gemini_key})
+    with st.sidebar.expander("Provider latency"):
+        if router is None:
+            st.write("Enter at least one API key to enable routing.")
+        else:
+            for s in router.snapshot():
+                p50 = f"{s['p50']:.2f}s" if s['p50'] is not None else "n/a"
+                p95 = f"{s['p95']:.2f}s" if s['p95'] is not None else "n/a"
+                st.write(f"**{s['provider']}** · p50 {p50} · p95 {p95} · errors {s['error_rate']:.0%} · {s['samples']} calls")
+
+with st.sidebar.expander("LLM response cache"):
+    cache_stats = cache.get_cache().stats()
+    st.write(f"Hits: {cache_stats['hits']} · Misses: {cache_stats['misses']}")
+    st.write(f"Entries in memory: {cache_stats['memory_entries']} · on disk: {cache_stats.get('disk_entries', 0)}")
+    if st.button("Clear cache"):
+        cache.get_cache().clear()
+
+# Filled in at the end of the script, once this run's timings are known
+debug_panel = st.sidebar.container()
+
+# --- Sakshi Meena details ---
+st.sidebar.markdown("""
+<hr style='border:1px solid #444;margin:1.2em 0;'>
+<div style='text-align:center;'>
+    <span style='font-size:1.3em;font-weight:bold;color:#4e54c8;'>Sakshi Meena</span><br>
+     <a href='mailto:sakshimeena7357@gmail.com' target='_blank' style='margin:0 6px;'>
+        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/gmail.svg' width='28' height='28' alt='Gmail' style='vertical-align:middle;filter:invert(36%) sepia(83%) saturate(2083%) hue-rotate(346deg) brightness(97%) contrast(97%);'>
+    </a>
+     <a href='https://github.com/Sakshi-meena' target='_blank' style='margin:0 6px;'>
+        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/github.svg' width='28' height='28' alt='GitHub' style='vertical-align:middle;filter:invert(100%) grayscale(100%);'>
+    </a>
+    <a href='https://www.linkedin.com/in/sakshimeena' target='_blank' style='margin:0 6px;'>
+        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/linkedin.svg' width='28' height='28' alt='LinkedIn' style='vertical-align:middle;filter:invert(33%) sepia(95%) saturate(746%) hue-rotate(182deg) brightness(94%) contrast(91%);'>
+    </a>
+    <a href='https://x.com/SMeena73?t=_1qWs4p3ihHZbmb8R-9KOA&s=09' target='_blank' style='margin:0 6px;'>
+        <img src='https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/x.svg' width='28' height='28' alt='Twitter (X)' style='vertical-align:middle;filter:invert(100%) grayscale(100%);'>
+    </a>
+    <br>
+    <span style='font-size:0.93em;color:#aaa;'>researcher@datafyassociates.com</span>
+</div>
+""", unsafe_allow_html=True)
+
+# Main app - Upload resumes and job description
+mode = st.radio("Evaluation mode", ["Single resume", "Batch ranking"], horizontal=True)
+batch_mode = mode == "Batch ranking"
+
+st.subheader("🧾 Upload Resumes (PDF/DOCX)")
+if batch_mode:
+    resume_files = st.file_uploader("Upload resumes (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
+    resume_file = None
+else:
+    resume_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=["pdf", "docx"], accept_multiple_files=False)
+    resume_files = []
+
+st.subheader("📋 Paste Job Description")
+job_description = st.text_area("Enter the job description here", height=200)
+
+if batch_mode:
+    shortlist_threshold = st.slider("Shortlist threshold (final score)", min_value=0, max_value=100, value=70)
+    prescreen_top_n = st.number_input(
+        "Pre-screen locally and send only the top N resumes to the LLM (0 = send all)",
+        min_value=0, value=0, step=10,
+    )
+
+if batch_mode and st.button("Run Batch Ranking"):
+    if not resume_files or not job_description.strip():
+        st.error("Please upload at least one resume and enter a job description.")
+    else:
+        import pandas as pd
+        timings = st.session_state["last_run"] = telemetry.start_run(record=record_timings)
+        try:
+            st.subheader("🏆 Ranked Candidates")
+            progress = st.progress(0.0, text="Scoring resumes...")
+            table = st.empty()
+            results = []
+            for row in batch.evaluate_resumes(
+                resume_files,
+                job_description,
+                llm_choice,
+                {"openai": openai_key, "groq": groq_key, "gemini": gemini_key},
+                max_workers=max_workers,
+                use_cache=use_cache,
+                prescreen_top_n=int(prescreen_top_n) or None,
+            ):
+                results.append(row)
+                progress.progress(len(results) / len(resume_files), text=f"Scored {len(results)}/{len(resume_files)} resumes")
+                table.dataframe(pd.DataFrame(batch.rank_results(results)), use_container_width=True, hide_index=True)
+            progress.empty()
+            failed = [r for r in results if r["error"]]
+            if failed:
+                st.warning(f"{len(failed)} resume(s) could not be evaluated: {', '.join(r['filename'] for r in failed)}")
+            shortlist = batch.rank_results(utils.filter_top_resumes(results, shortlist_threshold, key="final_score"))
+            st.subheader(f"✅ Shortlist (score ≥ {shortlist_threshold})")
+            if shortlist:
+                st.dataframe(pd.DataFrame(shortlist), use_container_width=True, hide_index=True)
+            else:
+                st.info("No resumes met the shortlist threshold.")
+        finally:
+            telemetry.end_run(timings)
+
+if not batch_mode and st.button("Run ATS Evaluation"):
+    if not resume_file or not job_description.strip():
+        st.error("Please upload a resume and enter a job description.")
+    else:
+        timings = st.session_state["last_run"] = telemetry.start_run(record=record_timings)
+        try:
+            st.subheader("🎯 ATS Results")
+            # JD-side analysis (requirements, skills, prompt prefix) is computed once per job description
+            profile = job_profile.get_job_profile(job_description)
+            resume_data = parser.read_bytes(resume_file)
+            with st.spinner("Processing resume..."):
+                resume_text, skill_match = analyze_resume(
+                    hashlib.sha256(resume_data).hexdigest(), resume_file.name, job_description, resume_data
+                )
+            requirements = profile.requirements
+
+            jd_skills, resume_skills, matched_skills, missing_skills = skill_match
+
+            # Infographic: Interactive and modern visualizations with Plotly (figures are cached by their inputs)
+            def render_radar(slot, ats_result):
+                radar_fig = radar_figure(ats_result["education_score"], ats_result["skills_score"], ats_result["experience_score"])
+                slot.plotly_chart(radar_fig, use_container_width=True)
+
+            def render_score_card(slot, ats_result):
+                slot.markdown(f"<div style='background:linear-gradient(90deg,#4e54c8,#8f94fb);padding:1.5em 1em;border-radius:16px;margin-bottom:1em;'>"
+                              f"<span style='font-size:2em;font-weight:bold;color:white;'>Final Score: {ats_result['final_score']}/100</span>"
+                              f"<br><span style='color:white;font-size:1.1em;'>{ats_result['overall_explanation']}</span>"
+                              f"</div>", unsafe_allow_html=True)
+
+            def render_sections(slot, ats_result, kind):
+                slot.markdown("\n".join(
+                    f"- **{label}:** {ats_result[f'{section}_{kind}']}"
+                    for label, section in (("Education", "education"), ("Skills", "skills"), ("Experience", "experience"))
+                ))
+
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                st.markdown(f"### 📝 {resume_file.name}")
+                st.markdown("#### Section Scores (Radar Chart)")
+                # Plotly radar/spider chart for section scores, redrawn as the scores stream in
+                radar_slot = st.empty()
+                # Interactive bar chart for skill coverage
+                st.markdown("#### Skill Coverage (Bar Chart)")
+                bar_fig, pie_fig = skill_figures(len(matched_skills), len(missing_skills))
+                st.plotly_chart(bar_fig, use_container_width=True)
+                # Interactive pie chart for skill match
+                st.markdown("#### Skill Match Overview (Pie Chart)")
+                if pie_fig is not None:
+                    st.plotly_chart(pie_fig, use_container_width=True)
+                else:
+                    st.info('No required skills found in the job description. Pie chart not displayed.')
+            with col2:
+                score_slot = st.empty()
+                tokens_slot = st.empty()
+                st.markdown("#### Job Requirements")
+                for req in requirements:
+                    st.markdown(f"- {req}")
+                st.markdown("#### Skills Overview")
+                st.markdown(f"<span style='color:#2196f3;font-weight:bold;'>Required (JD) Skills:</span> {', '.join(jd_skills) if jd_skills else 'None'}", unsafe_allow_html=True)
+                st.markdown(f"<span style='color:#ffa726;font-weight:bold;'>Skills Found in Resume:</span> {', '.join(resume_skills) if resume_skills else 'None'}", unsafe_allow_html=True)
+                st.markdown(f"<span style='color:lightgreen;font-weight:bold;'>Matched Skills:</span> {', '.join(matched_skills) if matched_skills else 'None'}", unsafe_allow_html=True)
+                st.markdown(f"<span style='color:#ff6666;font-weight:bold;'>Missing Skills:</span> {', '.join(missing_skills) if missing_skills else 'None'}", unsafe_allow_html=True)
+                st.markdown("#### Suggestions & Recommendations 🛠️")
+                suggestions_slot = st.empty()
+                st.markdown("#### Reasoning 🧠")
+                reasoning_slot = st.empty()
+
+            # Scores and explanations fill in field by field while the LLM response streams
+            score_slot.info("Scoring resume...")
+            for ats_result in scorer.score_resume_stream(
+                resume_text,
+                profile,
+                llm_choice,
+                {"openai": openai_key, "groq": groq_key, "gemini": gemini_key},
+                use_cache=use_cache,
+            ):
+                render_radar(radar_slot, ats_result)
+                render_score_card(score_slot, ats_result)
+                render_sections(suggestions_slot, ats_result, "suggestions")
+                render_sections(reasoning_slot, ats_result, "reasoning")
+            if "prompt_tokens_original" in ats_result:
+                tokens_slot.caption(f"Prompt size: ~{ats_result['prompt_tokens_compacted']} tokens "
+                                    f"(~{ats_result['prompt_tokens_original']} before compaction)")
+        finally:
+            telemetry.end_run(timings)
+
+if record_timings:
+    with debug_panel.expander("⏱️ Last run breakdown"):
+        timings = st.session_state.get("last_run")
+        last_run = timings.summary() if timings is not None else None
+        if not last_run or not last_run["stages"]:
+            st.write("Run an evaluation to see where the time goes.")
+        else:
+            st.caption(f"Wall time: {last_run['wall_ms']:.0f} ms (stage totals add up across worker threads)")
+            st.dataframe(
+                [{k: round(v, 1) if isinstance(v, float) else v for k, v in stage.items()} for stage in last_run["stages"]],
+                use_container_width=True, hide_index=True,
+            )
+            for name, value in last_run["counters"].items():
+                st.write(f"`{name}`: {value:g}")
+
+# Runs once per process, after the first page has been sent
+preload_dependencies()
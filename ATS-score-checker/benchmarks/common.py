@@ -0,0 +1,81 @@
+# Timing, percentile and result-file helpers shared by the benchmark scripts
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """q-th percentile (0-100) with linear interpolation."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def summarize(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Millisecond summary of per-call durations given in seconds."""
+    samples = [s * 1000 for s in samples_s]
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "min_ms": min(samples, default=0.0),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": max(samples, default=0.0),
+    }
+
+def measure(fn: Callable[[], Any], repeat: int = 30, warmup: int = 3, setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Time fn() repeat times (after warmup calls); setup() runs untimed before every call."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> Dict[str, Any]:
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def write_results(suite: str, results: Dict[str, Any], params: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Save {suite, environment, params, results} as JSON (default: results/<suite>-<commit>.json); returns the path."""
+    env = environment()
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{suite}-{env['commit'] or 'nogit'}-{int(time.time())}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"suite": suite, "environment": env, "params": params, "results": results}, f, indent=2)
+    return path
+
+def print_table(results: Dict[str, Dict[str, float]], columns: List[str] = ("p50_ms", "p95_ms", "max_ms")) -> None:
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  " + "  ".join(f"{c:>10}" for c in columns))
+    for name, stats in results.items():
+        print(f"{name:<{width}}  " + "  ".join(f"{stats.get(c, 0):>10.3f}" for c in columns))
@@ -0,0 +1,48 @@
+# Compare two benchmark result files and flag regressions
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+def _flatten(results: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, float(value)
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], metric_suffix: str = "p50_ms",
+            threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Relative change of every metric ending in metric_suffix; higher is worse except for throughput."""
+    old = dict(_flatten(baseline["results"]))
+    rows = []
+    for name, value in _flatten(current["results"]):
+        if name not in old or not (name.endswith(metric_suffix) or name.endswith("throughput_per_s")) or not old[name]:
+            continue
+        change = (value - old[name]) / old[name]
+        worse = -change if name.endswith("throughput_per_s") else change
+        rows.append({"name": name, "baseline": old[name], "current": value, "change": change, "regression": worse > threshold})
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Compare two benchmark result JSON files.")
+    arg_parser.add_argument("baseline")
+    arg_parser.add_argument("current")
+    arg_parser.add_argument("--metric", default="p50_ms", help="Compare metrics ending with this name")
+    arg_parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    args = arg_parser.parse_args(argv)
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    print(f"baseline {baseline['environment'].get('commit')}  ->  current {current['environment'].get('commit')}")
+    rows = compare(baseline, current, args.metric, args.threshold)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<50} {row['baseline']:>10.3f} {row['current']:>10.3f} {row['change']:>+8.1%}{flag}")
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
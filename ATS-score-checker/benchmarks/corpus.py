@@ -0,0 +1,143 @@
+# Synthetic resume/JD corpus: PDF and DOCX files written without any extra dependency
+import argparse
+import os
+import random
+import zipfile
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence
+
+from modules.utils import SKILLS_WHITELIST
+
+SKILLS = sorted(SKILLS_WHITELIST)
+FILLER_WORDS = (
+    "designed built shipped maintained improved reduced increased led owned migrated automated analysed "
+    "platform service pipeline dashboard customers revenue latency quality reliability team stakeholders "
+    "project product release process system report model feature backlog roadmap budget"
+).split()
+DEGREES = ("BSc Computer Science", "B.Tech Information Technology", "MSc Data Science", "MBA", "PhD Physics", "Diploma in Accounting")
+LINES_PER_PAGE = 50
+
+def _sentence(rng: random.Random, n_words: int, skills: Sequence[str], skill_density: float) -> str:
+    words = []
+    for _ in range(n_words):
+        words.append(rng.choice(skills) if skills and rng.random() < skill_density else rng.choice(FILLER_WORDS))
+    return " ".join(words).capitalize() + "."
+
+def make_resume_text(rng: random.Random, n_skills: int = 12, n_roles: int = 4, bullets_per_role: int = 5,
+                     words_per_bullet: int = 14, skill_density: float = 0.1) -> str:
+    """Resume with Education/Skills/Experience sections; skill_density is the share of experience words that are skills."""
+    skills = rng.sample(SKILLS, min(n_skills, len(SKILLS)))
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com | +1 555 0100", "",
+             "Education", f"{rng.choice(DEGREES)}, State University, {rng.randint(2005, 2022)}", "",
+             "Skills", ", ".join(skills), "", "Experience"]
+    for role in range(n_roles):
+        lines.append(f"Engineer {role + 1}, Company {rng.randint(1, 500)} ({2010 + role}-{2011 + role})")
+        lines.extend(f"- {_sentence(rng, words_per_bullet, skills, skill_density)}" for _ in range(bullets_per_role))
+    return "\n".join(lines)
+
+def make_job_description(rng: random.Random, n_skills: int = 8, n_requirements: int = 8, words_per_line: int = 12) -> str:
+    skills = rng.sample(SKILLS, min(n_skills, len(SKILLS)))
+    lines = ["Senior Engineer", "", "About the role", _sentence(rng, 30, skills, 0.05), "", "Requirements"]
+    lines.extend(f"- Must have experience with {skill}" for skill in skills)
+    lines.extend(f"- {_sentence(rng, words_per_line, skills, 0.1)}" for _ in range(max(0, n_requirements - len(skills))))
+    lines += ["", "Qualifications", f"- {rng.choice(DEGREES)} or equivalent"]
+    return "\n".join(lines)
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(text: str, lines_per_page: int = LINES_PER_PAGE) -> bytes:
+    """Minimal PDF 1.4 (Helvetica text pages) that pypdf can extract the text from."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    n = len(pages)
+    font_id = 3 + 2 * n
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n))
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode()]
+    for i, page in enumerate(pages):
+        content = "".join(f"({_pdf_escape(line)}) Tj T* " for line in page)
+        stream = f"BT /F1 10 Tf 14 TL 50 750 Td {content}ET".encode("latin-1", "replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def _xml_escape(line: str) -> str:
+    return line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def make_docx(text: str) -> bytes:
+    """Minimal DOCX (one paragraph per line) that docx2txt can read."""
+    body = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{_xml_escape(line)}</w:t></w:r></w:p>" for line in text.splitlines())
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>',
+        )
+        archive.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "word/document.xml",
+            '<?xml version="1.0" encoding="UTF-8"?><w:document '
+            'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+    return buffer.getvalue()
+
+def generate_corpus(out_dir: str, n_resumes: int = 50, formats: Sequence[str] = ("pdf", "docx"), seed: int = 0,
+                    resume_options: Optional[Dict] = None, jd_options: Optional[Dict] = None) -> List[str]:
+    """Write n_resumes resumes (alternating formats) and jd.txt to out_dir; returns the resume paths."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "jd.txt"), "w", encoding="utf-8") as f:
+        f.write(make_job_description(rng, **(jd_options or {})))
+    paths = []
+    for i in range(n_resumes):
+        fmt = formats[i % len(formats)]
+        text = make_resume_text(rng, **(resume_options or {}))
+        path = os.path.join(out_dir, f"resume_{i:05d}.{fmt}")
+        with open(path, "wb") as f:
+            f.write(make_pdf(text) if fmt == "pdf" else make_docx(text))
+        paths.append(path)
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Write a synthetic resume corpus and job description.")
+    arg_parser.add_argument("out_dir")
+    arg_parser.add_argument("-n", "--resumes", type=int, default=50)
+    arg_parser.add_argument("--formats", default="pdf,docx", help="Comma-separated: pdf, docx")
+    arg_parser.add_argument("--roles", type=int, default=4, help="Experience entries per resume (controls length)")
+    arg_parser.add_argument("--skills", type=int, default=12, help="Skills listed per resume")
+    arg_parser.add_argument("--skill-density", type=float, default=0.1, help="Share of experience words that are skills")
+    arg_parser.add_argument("--jd-skills", type=int, default=8)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+    paths = generate_corpus(
+        args.out_dir, args.resumes, args.formats.split(","), args.seed,
+        resume_options={"n_roles": args.roles, "n_skills": args.skills, "skill_density": args.skill_density},
+        jd_options={"n_skills": args.jd_skills},
+    )
+    print(f"Wrote {len(paths)} resumes and jd.txt to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# End-to-end throughput/latency harness: corpus -> evaluate_resume -> local fake LLM server
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from modules import cache, parser
+from modules.batch import bounded_map, evaluate_resume
+
+from .common import summarize, write_results
+from .corpus import generate_corpus
+from .fake_llm import FakeLLMConfig, start_server
+
+def _timed_evaluate(path: str, jd: str, llm_choice: str, api_keys: Dict[str, str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        row = evaluate_resume(f, jd, llm_choice, api_keys, use_cache=False)
+    return {"seconds": time.perf_counter() - start, "error": row.get("error"), "score": row.get("final_score")}
+
+def run(n_resumes: int = 50, concurrency: int = 8, config: Optional[FakeLLMConfig] = None,
+        corpus_dir: Optional[str] = None, base_url: Optional[str] = None, seed: int = 0) -> Dict[str, Any]:
+    """Score a synthetic corpus through the OpenAI provider pointed at the fake server (or at base_url)."""
+    server = None
+    if base_url is None:
+        server = start_server(config or FakeLLMConfig(seed=seed))
+        base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = generate_corpus(corpus_dir or tmp, n_resumes, seed=seed)
+            with open(os.path.join(corpus_dir or tmp, "jd.txt"), encoding="utf-8") as f:
+                jd = f.read()
+            parser.clear_cache()
+            cache.get_cache().clear()
+            api_keys = {"openai": "benchmark", "openai_base_url": base_url}
+            start = time.perf_counter()
+            rows = list(bounded_map(lambda p: _timed_evaluate(p, jd, "OpenAI", api_keys), paths, concurrency))
+            wall = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    errors = [row["error"] for row in rows if row["error"]]
+    results = {
+        "resumes": len(rows),
+        "wall_s": wall,
+        "throughput_per_s": len(rows) / wall if wall else 0.0,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "latency": summarize([row["seconds"] for row in rows]),
+    }
+    if server is not None:
+        results["server_requests"] = server.config.requests
+        results["server_injected_errors"] = server.config.errors
+    return results
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Run the end-to-end scoring benchmark against a fake LLM server.")
+    arg_parser.add_argument("-n", "--resumes", type=int, default=50)
+    arg_parser.add_argument("-c", "--concurrency", type=int, default=8)
+    arg_parser.add_argument("--latency", type=float, default=0.3, help="Fake LLM response latency in seconds")
+    arg_parser.add_argument("--jitter", type=float, default=0.1)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of LLM requests that fail")
+    arg_parser.add_argument("--error-status", type=int, default=429)
+    arg_parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of LLM answers with missing fields")
+    arg_parser.add_argument("--base-url", help="Use an already running OpenAI-compatible server instead")
+    arg_parser.add_argument("--corpus-dir", help="Keep the generated corpus here instead of a temporary directory")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/e2e-<commit>-<time>.json)")
+    args = arg_parser.parse_args(argv)
+    config = FakeLLMConfig(args.latency, args.jitter, error_rate=args.error_rate, error_status=args.error_status,
+                           malformed_rate=args.malformed_rate, seed=args.seed)
+    results = run(args.resumes, args.concurrency, config, args.corpus_dir, args.base_url, args.seed)
+    latency = results["latency"]
+    print(f"{results['resumes']} resumes in {results['wall_s']:.2f}s ({results['throughput_per_s']:.1f}/s), "
+          f"{results['errors']} errors; p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms, "
+          f"p99 {latency['p99_ms']:.0f} ms")
+    path = write_results("e2e", results, vars(args), args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
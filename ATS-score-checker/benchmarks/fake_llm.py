@@ -0,0 +1,157 @@
+# Local OpenAI-compatible chat-completions server with configurable latency and error injection
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+_SCORE_NAMES = ("education", "skills", "experience")
+
+class FakeLLMConfig:
+    """
+    latency: seconds before the response starts (plus uniform jitter up to `jitter`);
+    token_delay: seconds between streamed chunks; error_rate: share of requests answered with
+    error_status (429 carries Retry-After); malformed_rate: share of answers missing fields.
+    """
+    def __init__(self, latency: float = 0.3, jitter: float = 0.1, token_delay: float = 0.005,
+                 error_rate: float = 0.0, error_status: int = 429, malformed_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def roll(self, rate: float) -> bool:
+        with self.lock:
+            return self.random.random() < rate
+
+def fake_scores(prompt: str, malformed: bool) -> Dict[str, Any]:
+    """Deterministic scores derived from the prompt, so cached and uncached runs agree."""
+    seed = sum(map(ord, prompt[-2000:]))
+    scores = {name: 40 + (seed >> (3 * i)) % 60 for i, name in enumerate(_SCORE_NAMES)}
+    result: Dict[str, Any] = {}
+    for name in _SCORE_NAMES:
+        result[f"{name}_score"] = scores[name]
+        result[f"{name}_reasoning"] = f"Synthetic reasoning for {name}."
+        result[f"{name}_suggestions"] = f"Synthetic suggestions for {name}."
+    result["final_score"] = round(0.25 * scores["education"] + 0.40 * scores["skills"] + 0.35 * scores["experience"])
+    result["overall_explanation"] = "Synthetic evaluation from the benchmark LLM server."
+    if malformed:
+        result.pop("skills_reasoning")
+        result["experience_score"] = "n/a"
+    return result
+
+def _requested_fields(prompt: str) -> Optional[list]:
+    # Follow-up requests for specific fields (see scorer.repair_fields) list them after "ONLY these keys:"
+    match = re.search(r"ONLY these keys: ([a-z_, ]+)\.", prompt)
+    return [f.strip() for f in match.group(1).split(",")] if match else None
+
+def render_answer(prompt: str, json_mode: bool, malformed: bool) -> str:
+    fields = _requested_fields(prompt)
+    result = fake_scores(prompt, malformed and fields is None)
+    if fields:
+        return json.dumps({f: result.get(f) for f in fields})
+    if json_mode:
+        return json.dumps(result)
+    return "\n".join(f"{key.replace('_', ' ').title()}: {value}" for key, value in result.items())
+
+def make_handler(config: FakeLLMConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+            with config.lock:
+                config.requests += 1
+                # random.Random is shared by all handler threads, so it is only used under the lock
+                delay = config.latency + config.random.uniform(0, config.jitter)
+            time.sleep(max(0.0, delay))
+            if config.roll(config.error_rate):
+                with config.lock:
+                    config.errors += 1
+                payload = json.dumps({"error": {"message": "injected error", "type": "fake"}}).encode()
+                self.send_response(config.error_status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                if config.error_status == 429:
+                    self.send_header("retry-after", "0.05")
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+            answer = render_answer(prompt, json_mode, config.roll(config.malformed_rate))
+            usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(answer) // 4,
+                     "total_tokens": (len(prompt) + len(answer)) // 4}
+            if body.get("stream"):
+                self._stream(body.get("model", "fake"), answer)
+            else:
+                payload = json.dumps({
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": answer}}],
+                    "usage": usage,
+                }).encode()
+                self.send_response(200)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        def _stream(self, model: str, answer: str) -> None:
+            self.send_response(200)
+            self.send_header("content-type", "text/event-stream")
+            self.send_header("connection", "close")
+            self.end_headers()
+            for i in range(0, len(answer), 16):
+                event = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                         "choices": [{"index": 0, "delta": {"content": answer[i:i + 16]}, "finish_reason": None}]}
+                self.wfile.write(b"data: " + json.dumps(event).encode() + b"\n\n")
+                self.wfile.flush()
+                time.sleep(config.token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+    return Handler
+
+def start_server(config: Optional[FakeLLMConfig] = None, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread; its base URL is http://host:<server.server_port>/v1."""
+    config = config or FakeLLMConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    server.config = config
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Serve a fake OpenAI-compatible LLM for benchmarks.")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8400)
+    arg_parser.add_argument("--latency", type=float, default=0.3)
+    arg_parser.add_argument("--jitter", type=float, default=0.1)
+    arg_parser.add_argument("--token-delay", type=float, default=0.005)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--error-status", type=int, default=429)
+    arg_parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = arg_parser.parse_args()
+    config = FakeLLMConfig(args.latency, args.jitter, args.token_delay, args.error_rate, args.error_status, args.malformed_rate)
+    server = start_server(config, args.host, args.port)
+    print(f"Fake LLM listening on http://{args.host}:{server.server_port}/v1 (use as openai_base_url)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
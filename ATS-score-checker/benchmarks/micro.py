@@ -0,0 +1,72 @@
+# Micro-benchmarks for text extraction, skill matching and LLM response parsing
+import argparse
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+from modules import parser, scorer
+from modules.job_profile import get_job_profile
+from modules.skill_matrix import SkillMatrix
+from modules.utils import extract_all_resume_skills, extract_skills_from_text, match_skills
+
+from .common import measure, print_table, write_results
+from .corpus import make_docx, make_job_description, make_pdf, make_resume_text
+from .fake_llm import fake_scores
+
+SIZES = {"small": 2, "medium": 6, "large": 20}  # experience entries per resume
+MATRIX_RESUMES = 500
+MATRIX_JOBS = 20
+
+def _line_response(result: Dict[str, Any]) -> str:
+    return "\n".join(f"{key.replace('_', ' ').title()}: {value}" for key, value in result.items())
+
+def run(repeat: int = 30, seed: int = 0, sizes: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    jd = make_job_description(rng)
+    profile = get_job_profile(jd)
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes or list(SIZES):
+        text = make_resume_text(rng, n_roles=SIZES[size])
+        pdf, docx = make_pdf(text), make_docx(text)
+        # Clear the extraction cache before every call so the parse itself is timed
+        results[f"parser.extract_text[pdf,{size}]"] = measure(
+            lambda: parser.extract_bytes("resume.pdf", pdf), repeat, setup=parser.clear_cache)
+        results[f"parser.extract_text[docx,{size}]"] = measure(
+            lambda: parser.extract_bytes("resume.docx", docx), repeat, setup=parser.clear_cache)
+        results[f"utils.extract_skills_from_text[{size}]"] = measure(lambda: extract_skills_from_text(text), repeat)
+        results[f"utils.extract_all_resume_skills[{size}]"] = measure(lambda: extract_all_resume_skills(text), repeat)
+        results[f"utils.match_skills[{size}]"] = measure(lambda: match_skills(jd, text), repeat)
+        results[f"utils.match_skills[profile,{size}]"] = measure(lambda: match_skills(profile, text), repeat)
+
+    # Vectorized pool x JD matching; the coverage cache is dropped before every call
+    matrix = SkillMatrix()
+    for i in range(MATRIX_RESUMES):
+        matrix.add_resume(i, make_resume_text(rng, n_roles=SIZES["small"]))
+    for j in range(MATRIX_JOBS):
+        matrix.add_job(j, make_job_description(rng))
+    reset = lambda: setattr(matrix, "_coverage", None)
+    results[f"skill_matrix.coverage[{MATRIX_RESUMES}x{MATRIX_JOBS}]"] = measure(matrix.coverage, repeat, setup=reset)
+    results[f"skill_matrix.top_k[{MATRIX_RESUMES}x{MATRIX_JOBS}]"] = measure(lambda: matrix.top_k(10), repeat, setup=reset)
+
+    answer = fake_scores(jd, malformed=False)
+    line_response, json_response = _line_response(answer), json.dumps(answer)
+    chunks = [line_response[i:i + 16] for i in range(0, len(line_response), 16)]
+    results["scorer.parse_response[lines]"] = measure(lambda: scorer.parse_response(line_response), repeat * 10)
+    results["scorer.parse_response[json]"] = measure(lambda: scorer.parse_response(json_response), repeat * 10)
+    results["scorer.iter_response_fields[stream]"] = measure(lambda: list(scorer.iter_response_fields(chunks)), repeat * 10)
+    return results
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Run the parsing/matching micro-benchmarks.")
+    arg_parser.add_argument("--repeat", type=int, default=30)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--sizes", default=",".join(SIZES), help="Comma-separated: " + ", ".join(SIZES))
+    arg_parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/micro-<commit>-<time>.json)")
+    args = arg_parser.parse_args(argv)
+    results = run(args.repeat, args.seed, args.sizes.split(","))
+    print_table(results)
+    path = write_results("micro", results, vars(args), args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-def main():
-    print("Hello from genai-ats!")
-
-
-if __name__ == "__main__":
-    main()
+def main():
+    print("Hello from genai-ats!")
+
+
+if __name__ == "__main__":
+    main()
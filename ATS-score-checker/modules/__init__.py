@@ -1 +1 @@
-# modules package for ATS system
+# modules package for ATS system
@@ -0,0 +1,195 @@
+# Batch ranking of many resumes against a single job description
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import parser, telemetry
+from .job_profile import JobProfile, get_job_profile
+from .llm_handler import is_configured, model_id
+from .scorer import SCORE_FIELDS, LocalCorpus, prescreen, score_resume, score_resumes_local
+from .utils import match_skills
+
+if TYPE_CHECKING:
+    from .candidate_index import CandidateIndex
+
+DEFAULT_CONCURRENCY = 8
+# Resumes extracted and prescreened together (BM25 statistics still cover the whole batch, see scorer.LocalCorpus)
+PRESCREEN_CHUNK = 256
+
+def _empty_row(filename: str) -> Dict[str, Any]:
+    return {
+        'filename': filename,
+        'final_score': 0,
+        'education_score': 0,
+        'skills_score': 0,
+        'experience_score': 0,
+        'matched_skills': '',
+        'missing_skills': '',
+        'overall_explanation': '',
+        'scoring': '',
+        'error': '',
+    }
+
+def _fill_row(row: Dict[str, Any], ats_result: Dict[str, Any], matched: List[str], missing: List[str], scoring: str) -> Dict[str, Any]:
+    for key in ('final_score', 'education_score', 'skills_score', 'experience_score', 'overall_explanation'):
+        row[key] = ats_result[key]
+    row['matched_skills'] = ', '.join(matched)
+    row['missing_skills'] = ', '.join(missing)
+    row['scoring'] = scoring
+    row['error'] = ats_result.get('error', '')
+    return row
+
+def evaluate_resume(uploaded_file: Any, job: Union[str, JobProfile], llm_choice: str, api_keys: Dict[str, str],
+                    use_cache: bool = True, index: Optional["CandidateIndex"] = None) -> Dict[str, Any]:
+    """
+    Extract, skill-match and score one resume.
+    Returns a flat result row; failures are reported in the 'error' field instead of raised,
+    so one broken file does not abort the whole batch.
+    index: a CandidateIndex to read extracted text and stored scores from, and to record new ones in.
+    """
+    row = _empty_row(uploaded_file.name)
+    if index is not None:
+        try:
+            content_hash = index.add_file(uploaded_file)
+        except Exception as e:
+            row['error'] = str(e)
+            return row
+        return evaluate_indexed(index, content_hash, job, llm_choice, api_keys, use_cache, filename=uploaded_file.name)
+    try:
+        resume_text = parser.extract_text(uploaded_file)
+        _, _, matched, missing = match_skills(job, resume_text)
+        ats_result = score_resume(resume_text, job, llm_choice, api_keys, use_cache=use_cache)
+    except Exception as e:
+        row['error'] = str(e)
+        return row
+    return _fill_row(row, ats_result, matched, missing, 'llm' if is_configured(llm_choice, api_keys) else 'local')
+
+def _is_complete(ats_result: Dict[str, Any]) -> bool:
+    """True when every SCORE_FIELDS value came from the scorer rather than defaulting to 0."""
+    missing = set(ats_result.get('missing_scores', ()))
+    return not ats_result.get('error') and not missing.intersection(SCORE_FIELDS)
+
+def evaluate_indexed(index: "CandidateIndex", content_hash: str, job: Union[str, JobProfile], llm_choice: str,
+                     api_keys: Dict[str, str], use_cache: bool = True, filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Score a resume already in the candidate index, without touching its file.
+    A score stored for the same (JD, model) is reused; a new one is stored only when it is complete.
+    """
+    profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+    row = _empty_row(filename or content_hash)
+    try:
+        resume = index.get_resume(content_hash)
+        if resume is None:
+            raise KeyError(f"resume {content_hash} is not in the index")
+        row['filename'] = filename or resume.filename
+        model = model_id(llm_choice, api_keys)
+        ats_result = index.get_score(content_hash, profile.jd_hash, model)
+        if ats_result is None:
+            ats_result = score_resume(resume.text, profile, llm_choice, api_keys, use_cache=use_cache)
+            # Failed or partial results are left out so the next run (iter_unscored) retries them
+            if _is_complete(ats_result):
+                index.set_score(content_hash, profile.jd_hash, model, ats_result)
+    except Exception as e:
+        row['error'] = str(e)
+        return row
+    matched = sorted(profile.skill_set & resume.skills)
+    missing = sorted(profile.skill_set - resume.skills)
+    return _fill_row(row, ats_result, matched, missing, 'local' if model == 'local' else 'llm')
+
+def evaluate_resumes(uploaded_files: Iterable[Any], job_description: str, llm_choice: str, api_keys: Dict[str, str],
+                     max_workers: int = DEFAULT_CONCURRENCY, use_cache: bool = True,
+                     prescreen_top_n: Optional[int] = None, prescreen_threshold: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluate resumes on a bounded worker pool and yield each result row as soon as it finishes.
+    Extraction and LLM scoring run inside the workers, so at most max_workers LLM requests are in flight.
+    The job description is compiled into a JobProfile once for the whole batch.
+    With prescreen_top_n and/or prescreen_threshold, every resume is first scored locally
+    (scorer.score_resumes_local) and only the selected candidates are sent to the LLM.
+    """
+    profile = get_job_profile(job_description)
+    if prescreen_top_n is None and prescreen_threshold is None:
+        yield from bounded_map(
+            lambda f: evaluate_resume(f, profile, llm_choice, api_keys, use_cache),
+            uploaded_files,
+            max_workers,
+        )
+        return
+    yield from _evaluate_prescreened(list(uploaded_files), profile, llm_choice, api_keys, max_workers, use_cache,
+                                     prescreen_top_n, prescreen_threshold)
+
+def _extract(uploaded_file: Any) -> Tuple[str, str]:
+    try:
+        return parser.extract_text(uploaded_file), ''
+    except Exception as e:
+        return '', str(e)
+
+def _evaluate_prescreened(uploaded_files: List[Any], profile: JobProfile, llm_choice: str, api_keys: Dict[str, str],
+                          max_workers: int, use_cache: bool, top_n: Optional[int], threshold: Optional[int]) -> Iterator[Dict[str, Any]]:
+    # Two passes over PRESCREEN_CHUNK resumes at a time, so memory is bounded by the chunk, not the batch:
+    # the first collects BM25 statistics over every resume, so scores from different chunks are comparable;
+    # the second scores each chunk against them. Later extractions of a file are parser cache hits.
+    corpus = LocalCorpus(profile)
+    candidates: List[int] = []  # uploaded_files index of each resume that could be extracted
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        extract = telemetry.bind_run(_extract)
+        for start in range(0, len(uploaded_files), PRESCREEN_CHUNK):
+            chunk = uploaded_files[start:start + PRESCREEN_CHUNK]
+            for offset, (text, error) in enumerate(pool.map(extract, chunk)):
+                if error:
+                    row = _empty_row(chunk[offset].name)
+                    row['error'] = error
+                    yield row
+                    continue
+                candidates.append(start + offset)
+                corpus.add(text)
+        local_results: List[Dict[str, Any]] = []
+        skills: List[Tuple[List[str], List[str]]] = []
+        for start in range(0, len(candidates), PRESCREEN_CHUNK):
+            chunk = [uploaded_files[i] for i in candidates[start:start + PRESCREEN_CHUNK]]
+            texts = [text for text, _ in pool.map(extract, chunk)]
+            for text in texts:
+                _, _, matched, missing = match_skills(profile, text)
+                skills.append((matched, missing))
+            local_results.extend(score_resumes_local(texts, profile, corpus))
+    escalate = set(prescreen(local_results, top_n, threshold)) if is_configured(llm_choice, api_keys) else set()
+    # Candidates that stay local are final right away; the LLM ones stream in as they finish
+    for k, i in enumerate(candidates):
+        if k not in escalate:
+            matched, missing = skills[k]
+            yield _fill_row(_empty_row(uploaded_files[i].name), local_results[k], matched, missing, 'local')
+
+    def score_with_llm(k: int) -> Dict[str, Any]:
+        uploaded_file = uploaded_files[candidates[k]]
+        row = _empty_row(uploaded_file.name)
+        matched, missing = skills[k]
+        try:
+            ats_result = score_resume(parser.extract_text(uploaded_file), profile, llm_choice, api_keys, use_cache=use_cache)
+        except Exception as e:
+            # Keep the local score rather than dropping the candidate
+            row = _fill_row(row, local_results[k], matched, missing, 'local')
+            row['error'] = str(e)
+            return row
+        return _fill_row(row, ats_result, matched, missing, 'llm')
+
+    yield from bounded_map(score_with_llm, sorted(escalate), max_workers)
+
+def bounded_map(fn: Callable[[Any], Any], items: Iterable[Any], max_workers: int = DEFAULT_CONCURRENCY) -> Iterator[Any]:
+    """
+    Like ThreadPoolExecutor.map, but yields results in completion order and only pulls
+    items from the (possibly lazy) iterable as workers free up, so memory stays flat.
+    """
+    max_workers = max(1, max_workers)
+    fn = telemetry.bind_run(fn)  # worker spans belong to the caller's run
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(fn, item) for item in islice(items, 2 * max_workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            for item in islice(items, len(done)):
+                pending.add(pool.submit(fn, item))
+
+def rank_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort result rows by final score (best first), then by filename for a stable order."""
+    return sorted(results, key=lambda r: (-r.get('final_score', 0), r.get('filename', '')))
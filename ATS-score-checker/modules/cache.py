@@ -0,0 +1,157 @@
+# Content-addressed cache for LLM responses: in-memory LRU tier plus optional on-disk SQLite tier
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from . import telemetry
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Hash of everything that determines the completion; whitespace in the prompt is normalized."""
+    normalized_prompt = " ".join(prompt.split())
+    payload = json.dumps([model, normalized_prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """
+    Two-tier response cache.
+    memory tier: LRU bounded by max_entries.
+    disk tier (only when db_path is given): SQLite with TTL expiry and least-recently-used
+    eviction beyond max_disk_entries, so cached responses survive process restarts.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES, db_path: Optional[str] = None,
+                 ttl: float = DEFAULT_TTL_SECONDS, max_disk_entries: int = DEFAULT_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0}
+        self._db = None
+        if db_path:
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+            value = self._get_disk(key)
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            self._set_memory(key, value)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._set_memory(key, value)
+            if self._db is not None:
+                now = time.time()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    # Coroutine variants: SQLite calls block, so with a disk tier they run on a worker thread
+    async def aget(self, key: str) -> Optional[str]:
+        if self._db is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        if self._db is None:
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return stats
+
+    def _set_memory(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        now = time.time()
+        if now - created > self.ttl:
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return value
+
+    def _evict_disk(self, now: float) -> None:
+        self._db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN "
+            "(SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+# Process-wide cache, kept at module level so it survives Streamlit reruns.
+# Set ATS_LLM_CACHE_PATH to enable the on-disk tier.
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> LLMCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(db_path=os.getenv("ATS_LLM_CACHE_PATH") or None)
+        return _cache
+
+def configure_cache(**kwargs) -> LLMCache:
+    """Replace the process-wide cache, e.g. configure_cache(db_path='.cache/llm.sqlite', ttl=86400)."""
+    global _cache
+    with _cache_lock:
+        _cache = LLMCache(**kwargs)
+        return _cache
+
+# Exported as ats_llm_cache_hits, ats_llm_cache_misses, ... gauges
+telemetry.register_collector("llm_cache", lambda: get_cache().stats())
@@ -0,0 +1,233 @@
+# Persistent candidate index: extracted text, skills and per-(JD, model) scores keyed by resume content hash
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Union
+
+from . import parser
+from .job_profile import JobProfile, get_job_profile
+from .utils import extract_all_resume_skills, extract_skills_from_text
+
+# Rows fetched per query when walking the whole pool, so memory stays flat however large it is
+PAGE_SIZE = 1000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS resumes ("
+    "id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL UNIQUE, filename TEXT NOT NULL, text TEXT NOT NULL, "
+    "added REAL NOT NULL, updated REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS skills (id INTEGER PRIMARY KEY, skill TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS resume_skills ("
+    "resume_id INTEGER NOT NULL, skill_id INTEGER NOT NULL, PRIMARY KEY (resume_id, skill_id)) WITHOUT ROWID",
+    # Job matching walks this index: only the rows of the JD's skills are read
+    "CREATE INDEX IF NOT EXISTS resume_skills_by_skill ON resume_skills (skill_id, resume_id)",
+    "CREATE TABLE IF NOT EXISTS scores ("
+    "resume_id INTEGER NOT NULL, jd_hash TEXT NOT NULL, model TEXT NOT NULL, final_score INTEGER NOT NULL, "
+    "result TEXT NOT NULL, scored REAL NOT NULL, PRIMARY KEY (jd_hash, model, resume_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS scores_ranking ON scores (jd_hash, model, final_score)",
+)
+
+@dataclass(frozen=True)
+class IndexedResume:
+    content_hash: str
+    filename: str
+    text: str
+    skills: FrozenSet[str]  # whitelisted plus free-form resume skills, as used by utils.match_skills
+
+def hash_content(data: bytes) -> str:
+    """SHA-256 of the file bytes, the same key parser.extract_bytes caches by."""
+    return hashlib.sha256(data).hexdigest()
+
+def resume_skills(text: str) -> FrozenSet[str]:
+    return frozenset(extract_skills_from_text(text) | extract_all_resume_skills(text))
+
+class CandidateIndex:
+    """
+    SQLite store of every resume seen, keyed by the hash of its file bytes: extracted text, skill set
+    and LLM/local score results per (job description hash, model). Files already in the index are
+    never parsed again, already-scored (resume, JD, model) triples are never scored again, and a new
+    job description can be matched against the whole pool with one indexed GROUP BY query.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    # --- resumes ---------------------------------------------------------------------------
+
+    def add_file(self, uploaded_file: Any) -> str:
+        """Index an uploaded/opened resume file (parsed only if its bytes are new); returns its content hash."""
+        return self.add_bytes(uploaded_file.name, parser.read_bytes(uploaded_file))
+
+    def add_bytes(self, filename: str, data: bytes) -> str:
+        content_hash = hash_content(data)
+        if content_hash in self:
+            return content_hash
+        text = parser.extract_bytes(filename, data)
+        self.upsert_resume(content_hash, filename, text)
+        return content_hash
+
+    def upsert_resume(self, content_hash: str, filename: str, text: str, skills: Optional[Iterable[str]] = None) -> None:
+        """Insert or replace a resume's text and skills (extracted from the text when not given)."""
+        skills = resume_skills(text) if skills is None else frozenset(skills)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO resumes (content_hash, filename, text, added, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (content_hash) DO UPDATE SET filename = excluded.filename, text = excluded.text, "
+                "updated = excluded.updated",
+                (content_hash, filename, text, now, now),
+            )
+            resume_id = self._resume_id(content_hash)
+            self._db.executemany("INSERT OR IGNORE INTO skills (skill) VALUES (?)", ((s,) for s in skills))
+            self._db.execute("DELETE FROM resume_skills WHERE resume_id = ?", (resume_id,))
+            self._db.executemany(
+                "INSERT INTO resume_skills (resume_id, skill_id) SELECT ?, id FROM skills WHERE skill = ?",
+                ((resume_id, s) for s in skills),
+            )
+            self._db.commit()
+
+    def get_resume(self, content_hash: str) -> Optional[IndexedResume]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, filename, text FROM resumes WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            skills = self._db.execute(
+                "SELECT s.skill FROM resume_skills rs JOIN skills s ON s.id = rs.skill_id WHERE rs.resume_id = ?",
+                (row[0],),
+            ).fetchall()
+        return IndexedResume(content_hash, row[1], row[2], frozenset(s for (s,) in skills))
+
+    def iter_hashes(self, page_size: int = PAGE_SIZE) -> Iterator[str]:
+        """Content hashes of every indexed resume, fetched a page at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, content_hash FROM resumes WHERE id > ? ORDER BY id LIMIT ?", (last_id, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for _, content_hash in rows:
+                yield content_hash
+
+    def remove(self, content_hash: str) -> None:
+        with self._lock:
+            resume_id = self._resume_id(content_hash)
+            if resume_id is None:
+                return
+            for table in ("resume_skills", "scores"):
+                self._db.execute(f"DELETE FROM {table} WHERE resume_id = ?", (resume_id,))
+            self._db.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+            self._db.commit()
+
+    def __contains__(self, content_hash: str) -> bool:
+        with self._lock:
+            return self._resume_id(content_hash) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    # --- scores ----------------------------------------------------------------------------
+
+    def get_score(self, content_hash: str, jd_hash: str, model: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sc.result FROM scores sc JOIN resumes r ON r.id = sc.resume_id "
+                "WHERE r.content_hash = ? AND sc.jd_hash = ? AND sc.model = ?",
+                (content_hash, jd_hash, model),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_score(self, content_hash: str, jd_hash: str, model: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            resume_id = self._resume_id(content_hash)
+            if resume_id is None:
+                raise KeyError(f"resume {content_hash} is not in the index")
+            self._db.execute(
+                "INSERT OR REPLACE INTO scores (resume_id, jd_hash, model, final_score, result, scored) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (resume_id, jd_hash, model, int(result.get('final_score', 0)), json.dumps(result, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+
+    def iter_unscored(self, jd_hash: str, model: str, page_size: int = PAGE_SIZE) -> Iterator[str]:
+        """Content hashes of resumes with no stored score for (jd_hash, model), a page at a time."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT r.id, r.content_hash FROM resumes r WHERE r.id > ? AND NOT EXISTS ("
+                    "SELECT 1 FROM scores sc WHERE sc.jd_hash = ? AND sc.model = ? AND sc.resume_id = r.id) "
+                    "ORDER BY r.id LIMIT ?",
+                    (last_id, jd_hash, model, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for _, content_hash in rows:
+                yield content_hash
+
+    def top_scores(self, jd_hash: str, model: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Best stored results for (jd_hash, model), highest final score first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT r.content_hash, r.filename, sc.result FROM scores sc JOIN resumes r ON r.id = sc.resume_id "
+                "WHERE sc.jd_hash = ? AND sc.model = ? ORDER BY sc.final_score DESC, r.id LIMIT ?",
+                (jd_hash, model, limit),
+            ).fetchall()
+        return [dict(json.loads(result), content_hash=h, filename=filename) for h, filename, result in rows]
+
+    # --- matching --------------------------------------------------------------------------
+
+    def match_job(self, job: Union[str, JobProfile], limit: int = 100, min_matched: int = 1) -> List[Dict[str, Any]]:
+        """
+        Resumes covering the most of the JD's whitelisted skills, without reading any file or resume text.
+        Only the index rows of the JD's skills are scanned, and SQLite keeps just the top `limit` in memory.
+        """
+        profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+        if not profile.skills:
+            return []
+        placeholders = ", ".join("?" * len(profile.skills))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT r.content_hash, r.filename, m.matched FROM ("
+                "SELECT rs.resume_id, COUNT(*) AS matched FROM resume_skills rs "
+                f"WHERE rs.skill_id IN (SELECT id FROM skills WHERE skill IN ({placeholders})) "
+                "GROUP BY rs.resume_id HAVING COUNT(*) >= ?) m JOIN resumes r ON r.id = m.resume_id "
+                "ORDER BY m.matched DESC, r.id LIMIT ?",
+                (*profile.skills, min_matched, limit),
+            ).fetchall()
+        return [
+            {'content_hash': h, 'filename': filename, 'matched': matched, 'missing': len(profile.skills) - matched}
+            for h, filename, matched in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                table: self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("resumes", "skills", "resume_skills", "scores")
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _resume_id(self, content_hash: str) -> Optional[int]:
+        row = self._db.execute("SELECT id FROM resumes WHERE content_hash = ?", (content_hash,)).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,159 @@
+# Headless batch entry point: score a directory (or glob) of resumes against one job description
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from . import telemetry
+from .batch import DEFAULT_CONCURRENCY, _empty_row, bounded_map, evaluate_indexed, evaluate_resume
+from .candidate_index import CandidateIndex
+from .job_profile import get_job_profile
+from .llm_handler import model_id
+from .utils import filter_top_resumes, get_file_extension
+
+RESUME_EXTENSIONS = {'.pdf', '.docx'}
+DEFAULT_LLM = "OpenAI gpt-3.5-turbo"
+
+def iter_resume_paths(inputs: Iterable[str]) -> Iterator[str]:
+    """Lazily yield PDF/DOCX paths from files, directories (recursively) and glob patterns."""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if get_file_extension(name) in RESUME_EXTENSIONS:
+                        yield os.path.join(root, name)
+        elif os.path.isfile(item):
+            yield item
+        else:
+            for path in glob.iglob(item, recursive=True):
+                if os.path.isfile(path) and get_file_extension(path) in RESUME_EXTENSIONS:
+                    yield path
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Paths already processed by a previous run (one per line)."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+def score_paths(paths: Iterable[str], job_description: str, llm_choice: str, api_keys: Dict[str, str],
+                max_workers: int = DEFAULT_CONCURRENCY, use_cache: bool = True,
+                index: Optional[CandidateIndex] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parse, skill-match and score each resume file; yields one result row per file as it completes.
+    With an index, files whose bytes are already indexed are not parsed again and stored scores are reused.
+    """
+    profile = get_job_profile(job_description)
+
+    def evaluate_path(path: str) -> Dict[str, Any]:
+        try:
+            with open(path, 'rb') as f:
+                return evaluate_resume(f, profile, llm_choice, api_keys, use_cache, index)
+        except OSError as e:
+            row = _empty_row(path)
+            row['error'] = str(e)
+            return row
+    return bounded_map(evaluate_path, paths, max_workers)
+
+def score_index(index: CandidateIndex, job_description: str, llm_choice: str, api_keys: Dict[str, str],
+                max_workers: int = DEFAULT_CONCURRENCY, use_cache: bool = True,
+                match_top: Optional[int] = None, unscored_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Score the resumes stored in the index without reading any file. With match_top, only the resumes
+    covering the most JD skills (CandidateIndex.match_job) are scored. With unscored_only, only the
+    resumes without a stored score for this JD and model are visited (CandidateIndex.iter_unscored).
+    """
+    profile = get_job_profile(job_description)
+    if match_top is not None:
+        hashes: Iterable[str] = [m['content_hash'] for m in index.match_job(profile, limit=match_top)]
+    elif unscored_only:
+        hashes = index.iter_unscored(profile.jd_hash, model_id(llm_choice, api_keys))
+    else:
+        hashes = index.iter_hashes()
+    return bounded_map(lambda h: evaluate_indexed(index, h, profile, llm_choice, api_keys, use_cache), hashes, max_workers)
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(
+        prog='ats-score',
+        description='Score resumes against a job description and stream one JSON object per resume.',
+        epilog='Exits with status 1 when any resume could not be evaluated (its row has a non-empty "error").',
+    )
+    arg_parser.add_argument('resumes', nargs='*',
+                            help='Resume files, directories or glob patterns (PDF/DOCX); '
+                                 'with --index and none given, the resumes already in the index are scored')
+    arg_parser.add_argument('--jd', required=True, help='Path to the job description text file')
+    arg_parser.add_argument('-o', '--output', help='Write JSONL here instead of stdout (appended to when it exists)')
+    arg_parser.add_argument('--llm', default=DEFAULT_LLM, help=f'LLM choice, as in the app sidebar (default: "{DEFAULT_LLM}")')
+    arg_parser.add_argument('-j', '--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Resumes evaluated in parallel')
+    arg_parser.add_argument('--threshold', type=int, default=None, help='Only output resumes with final_score >= THRESHOLD')
+    arg_parser.add_argument('--checkpoint', help='File recording successfully scored resume paths; paths listed there are skipped')
+    arg_parser.add_argument('--no-cache', action='store_true', help='Bypass the LLM response cache')
+    arg_parser.add_argument('--index', help='Candidate index (SQLite) that stores extracted text, skills and scores; '
+                                            'indexed files are not parsed again and already-scored resumes are not re-scored')
+    arg_parser.add_argument('--match-top', type=int, default=None,
+                            help='With --index and no resume paths: only score the N indexed resumes covering the most JD skills')
+    arg_parser.add_argument('--unscored-only', action='store_true',
+                            help='With --index and no resume paths: only score (and output) the indexed resumes '
+                                 'that have no stored score for this job description and model')
+    arg_parser.add_argument('--metrics-file', help='Write per-stage timings and token/retry/error counters here (Prometheus text format)')
+    arg_parser.add_argument('--trace-log', help="Append one JSON object per timed stage and counter update here ('-' for stderr)")
+    return arg_parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if not args.resumes and not args.index:
+        arg_parser.error('give resume paths, or --index to score the indexed resumes')
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    api_keys = {
+        "openai": os.getenv("OPENAI_API_KEY", ""),
+        "groq": os.getenv("GROQ_API_KEY", ""),
+        "gemini": os.getenv("GEMINI_API_KEY", ""),
+    }
+    with open(args.jd, encoding='utf-8') as f:
+        job_description = f.read()
+
+    if args.metrics_file or args.trace_log:
+        telemetry.configure(enabled=True, log_path=args.trace_log, metrics_path=args.metrics_file)
+    index = CandidateIndex(args.index) if args.index else None
+    done = load_checkpoint(args.checkpoint)
+    if args.resumes:
+        paths = (p for p in iter_resume_paths(args.resumes) if p not in done)
+        rows = score_paths(paths, job_description, args.llm, api_keys, args.concurrency, not args.no_cache, index)
+    else:
+        rows = score_index(index, job_description, args.llm, api_keys, args.concurrency, not args.no_cache,
+                           args.match_top, args.unscored_only)
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    checkpoint = open(args.checkpoint, 'a', encoding='utf-8') if args.checkpoint else None
+    scored = written = failed = 0
+    try:
+        for row in rows:
+            scored += 1
+            failed += bool(row.get('error'))
+            if args.threshold is None or filter_top_resumes([row], args.threshold, key='final_score'):
+                out.write(json.dumps(row, ensure_ascii=False) + '\n')
+                out.flush()
+                written += 1
+            # Failed resumes are left out of the checkpoint so a resumed run retries them
+            if checkpoint is not None and not row.get('error'):
+                checkpoint.write(row['filename'] + '\n')
+                checkpoint.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if index is not None:
+            index.close()
+        telemetry.write_metrics()
+    print(f"Scored {scored} resumes ({failed} failed, {len(done)} skipped from checkpoint), wrote {written}.", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
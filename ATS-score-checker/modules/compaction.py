@@ -0,0 +1,102 @@
+# Token-budgeted, section-aware compaction of resume text before it goes into the LLM prompt
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .utils import split_sections
+
+# Per-section token budgets; sections are trimmed to these sizes, most relevant content first
+DEFAULT_SECTION_BUDGETS = {'other': 200, 'education': 250, 'skills': 300, 'experience': 1200}
+SECTION_ORDER = ('other', 'education', 'skills', 'experience')
+SECTION_TITLES = {'other': '', 'education': 'Education', 'skills': 'Skills', 'experience': 'Experience'}
+
+# A short line repeated this often is a page header/footer, not content
+REPEATED_LINE_MIN_COUNT = 3
+REPEATED_LINE_MAX_LENGTH = 80
+TRUNCATION_MARKER = "[...]"
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+_SPACES_RE = re.compile(r"[ \t\u00a0\u200b]+")
+# Whole lines that are page numbers: "Page 2", "Page 2 of 3", "Page 2/3", "2 of 3", "- 2 -". Bare numbers and
+# "1/2" are left alone, since in a resume they are usually years or dates.
+_PAGE_NUMBER_RE = re.compile(r"(page\s+\d+(\s*(of|/)\s*\d+)?|\d+\s+of\s+\d+|-\s*\d+\s*-)", re.IGNORECASE)
+
+@dataclass(frozen=True)
+class CompactedText:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local estimate of BPE token count: one token per punctuation mark and roughly one per
+    four characters of each word (tiktoken-style tokenizers land within ~10% on English prose).
+    """
+    return sum(max(1, (len(piece) + 3) // 4) for piece in _WORD_RE.findall(text))
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces, strip every line and drop blank lines."""
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+def strip_repeated_lines(text: str, min_count: int = REPEATED_LINE_MIN_COUNT) -> str:
+    """Drop page numbers and keep only the first copy of short lines repeated on every page."""
+    lines = text.splitlines()
+    counts = Counter(line.lower() for line in lines)
+    seen = set()
+    kept: List[str] = []
+    for line in lines:
+        key = line.lower()
+        if _PAGE_NUMBER_RE.fullmatch(line):
+            continue
+        if counts[key] >= min_count and len(line) <= REPEATED_LINE_MAX_LENGTH:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept)
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """Keep whole lines while they fit in the token budget; the line that overflows is cut at a word."""
+    kept: List[str] = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line)
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        words: List[str] = []
+        for word in line.split():
+            cost = estimate_tokens(word)
+            if used + cost > budget:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(" ".join(words))
+        kept.append(TRUNCATION_MARKER)
+        break
+    return "\n".join(kept)
+
+def compact_resume(resume_text: str, section_budgets: Optional[Dict[str, int]] = None) -> CompactedText:
+    """
+    Normalize whitespace, strip page-repeated lines, split into sections and trim each section
+    to its token budget. Returns the compacted text with original/compacted token estimates.
+    """
+    budgets = dict(DEFAULT_SECTION_BUDGETS, **(section_budgets or {}))
+    cleaned = strip_repeated_lines(normalize_whitespace(resume_text))
+    sections = split_sections(cleaned)
+    parts = []
+    for name in SECTION_ORDER:
+        body = truncate_to_budget(sections[name], budgets[name]) if sections[name] else ""
+        if body:
+            parts.append(f"{SECTION_TITLES[name]}:\n{body}" if SECTION_TITLES[name] else body)
+    text = "\n\n".join(parts)
+    original_tokens = estimate_tokens(resume_text)
+    compacted_tokens = estimate_tokens(text)
+    if compacted_tokens >= estimate_tokens(cleaned):
+        # Nothing was trimmed: the section titles would only add tokens
+        text, compacted_tokens = cleaned, estimate_tokens(cleaned)
+    return CompactedText(text=text, original_tokens=original_tokens, compacted_tokens=compacted_tokens)
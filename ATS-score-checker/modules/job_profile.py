@@ -0,0 +1,108 @@
+# Precompiled job description: everything JD-side is computed once per posting, not once per resume
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple
+
+from . import telemetry
+from .compaction import normalize_whitespace
+from .prompts import ATS_SCORING_JSON_PROMPT, ATS_SCORING_PROMPT
+from .utils import SKILLS_WHITELIST, extract_skills_from_text
+
+# Position of every whitelisted skill in the skill-index vector
+SKILL_INDEX: Dict[str, int] = {skill: i for i, skill in enumerate(sorted(SKILLS_WHITELIST))}
+
+PROFILE_CACHE_ENTRIES = 64
+
+_BULLET_RE = re.compile(r'^[\-•*]')
+_REQUIREMENT_WORDS = ("require", "must", "should", "responsible", "expect", "qualif", "need")
+_SECTION_RES = [re.compile(p, re.IGNORECASE) for p in (r'requirements?', r'qualifications?', r'responsibilit(y|ies)')]
+_HEADER_RE = re.compile(r'^[A-Z ]{4,}$')
+
+_PROMPT_HEAD, _PROMPT_TAIL = ATS_SCORING_PROMPT.split("{resume_text}")
+# The JSON prompt shares the head, so only the part after the resume differs
+_JSON_PROMPT_TAIL = ATS_SCORING_JSON_PROMPT.split("{resume_text}")[1]
+
+@dataclass(frozen=True)
+class JobProfile:
+    job_description: str
+    jd_hash: str
+    requirements: Tuple[str, ...]
+    skills: Tuple[str, ...]  # whitelisted skills found in the JD, sorted
+    skill_set: FrozenSet[str]
+    skill_vector: Tuple[int, ...]  # SKILL_INDEX positions of the JD skills
+    prompt_prefix: str  # scoring prompt up to where the resume text goes
+    prompt_suffix: str
+    compact_prompt_prefix: str  # same, with the JD whitespace-normalized
+    json_prompt_suffix: str  # prompt_suffix of ATS_SCORING_JSON_PROMPT
+
+    def build_prompt(self, resume_text: str, compact: bool = False, structured: bool = False) -> str:
+        """
+        Same text as ATS_SCORING_PROMPT.format(job_description=..., resume_text=resume_text)
+        (ATS_SCORING_JSON_PROMPT with structured=True); with compact=True the JD part is whitespace-normalized.
+        """
+        prefix = self.compact_prompt_prefix if compact else self.prompt_prefix
+        return prefix + resume_text + (self.json_prompt_suffix if structured else self.prompt_suffix)
+
+def hash_job_description(job_description: str) -> str:
+    return hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+
+@telemetry.traced("job_profile.extract_requirements")
+def extract_requirements(job_description: str) -> List[str]:
+    """Requirement lines: bullets, lines with requirement verbs, and up to 10 lines under requirement-type headers."""
+    job_lines = [line.strip() for line in job_description.splitlines() if line.strip()]
+    requirements = []
+    # Extract bullet points and lines with key verbs
+    for line in job_lines:
+        l = line.lower()
+        if _BULLET_RE.match(l) or any(word in l for word in _REQUIREMENT_WORDS):
+            requirements.append(line)
+    # Extract lines under 'requirements', 'qualifications', 'responsibilities' sections
+    for i, line in enumerate(job_lines):
+        for pattern in _SECTION_RES:
+            if pattern.match(line):
+                # Collect up to 10 lines after the section header
+                for next_line in job_lines[i+1:i+11]:
+                    if next_line and not _HEADER_RE.match(next_line):
+                        requirements.append(next_line)
+    # Deduplicate and filter
+    requirements = list(dict.fromkeys([r for r in requirements if len(r) > 4]))
+    if not requirements:
+        requirements = job_lines
+    return requirements
+
+@telemetry.traced("job_profile.build")
+def build_job_profile(job_description: str) -> JobProfile:
+    skill_set = frozenset(extract_skills_from_text(job_description))
+    return JobProfile(
+        job_description=job_description,
+        jd_hash=hash_job_description(job_description),
+        requirements=tuple(extract_requirements(job_description)),
+        skills=tuple(sorted(skill_set)),
+        skill_set=skill_set,
+        skill_vector=tuple(sorted(SKILL_INDEX[s] for s in skill_set if s in SKILL_INDEX)),
+        prompt_prefix=_PROMPT_HEAD.format(job_description=job_description),
+        prompt_suffix=_PROMPT_TAIL.format(),
+        compact_prompt_prefix=_PROMPT_HEAD.format(job_description=normalize_whitespace(job_description)),
+        json_prompt_suffix=_JSON_PROMPT_TAIL.format(),
+    )
+
+_profiles: "OrderedDict[str, JobProfile]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+def get_job_profile(job_description: str) -> JobProfile:
+    """JobProfile for job_description, memoized by JD hash."""
+    jd_hash = hash_job_description(job_description)
+    with _profiles_lock:
+        profile = _profiles.get(jd_hash)
+        if profile is not None:
+            _profiles.move_to_end(jd_hash)
+            return profile
+    profile = build_job_profile(job_description)
+    with _profiles_lock:
+        _profiles[jd_hash] = profile
+        while len(_profiles) > PROFILE_CACHE_ENTRIES:
+            _profiles.popitem(last=False)
+    return profile
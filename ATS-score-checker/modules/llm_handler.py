@@ -1,79 +1,493 @@
-# from typing import Dict
-# import openai
-# import google.generativeai as genai
-
-# def query_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str]) -> str:
-#     """
-#     Query the selected LLM with the given prompt and API keys.
-#     llm_choice: 'OpenAI GPT-4o', 'Groq (Mixtral)', or 'Gemini Pro'
-#     Returns: LLM response as string
-#     """
-
-#     # ✅ OpenAI GPT-4o
-#     if llm_choice.startswith("OpenAI"):
-#         try:
-#             client = openai.OpenAI(api_key=api_keys.get("openai"))
-#             response = client.chat.completions.create(
-#                 model="gpt-4o",
-#                 messages=[{"role": "user", "content": prompt}],
-#                 max_tokens=600,
-#                 temperature=0.2,
-#             )
-#             return response.choices[0].message.content.strip()
-#         except Exception as e:
-#             return f"OpenAI Error: {str(e)}"
-
-#     # ✅ Gemini Pro (Google Generative AI)
-#     elif llm_choice.startswith("Gemini"):
-#         try:
-#             genai.configure(api_key=api_keys.get("gemini"))
-#             model = genai.GenerativeModel(model_name="models/gemini-pro")  # ✅ CORRECTED LINE
-#             response = model.generate_content(prompt)
-#             return response.text.strip()
-#         except Exception as e:
-#             return f"Gemini Error: {str(e)}"
-
-#     # 🔧 TODO: Add Groq here when you're ready
-#     # elif llm_choice.startswith("Groq"):
-#     #     ...
-
-#     # 🪂 Fallback if no LLM worked
-#     return (
-#         "Education Score: 0\nEducation Reasoning: Not evaluated.\nEducation Suggestions: N/A\n"
-#         "Skills Score: 0\nSkills Reasoning: Not evaluated.\nSkills Suggestions: N/A\n"
-#         "Experience Score: 0\nExperience Reasoning: Not evaluated.\nExperience Suggestions: N/A\n"
-#         "Final Score: 0\nOverall Explanation: No LLM response."
-#     )
-
-
-#real one
-
-# Handles LLM selection, API auth, and querying
-from typing import Dict, Tuple
-
-import openai
-
-def query_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str]) -> str:
-    """
-    Query the selected LLM with the given prompt and API keys.
-    llm_choice: 'OpenAI GPT-4o', 'Groq (Mixtral)', or 'Gemini Pro'
-    api_keys: dict with possible keys: 'openai', 'groq', 'gemini'
-    Returns: LLM response as string
-    """
-    if llm_choice.startswith("OpenAI"):
-        client = openai.OpenAI(api_key=api_keys.get("openai"))
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=600,
-            temperature=0.2,
-        )
-        return response.choices[0].message.content
-    # Optionally, add Groq and Gemini (Google Generative AI) support here
-    # For now, return a fallback response
-    return (
-        "Education Score: 0\nEducation Reasoning: Not evaluated.\nEducation Suggestions: N/A\n"
-        "Skills Score: 0\nSkills Reasoning: Not evaluated.\nSkills Suggestions: N/A\n"
-        "Experience Score: 0\nExperience Reasoning: Not evaluated.\nExperience Suggestions: N/A\n"
-        "Final Score: 0\nOverall Explanation: No LLM response."
-    )
+# from typing import Dict
+# import openai
+# import google.generativeai as genai
+
+# def query_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str]) -> str:
+#     """
+#     Query the selected LLM with the given prompt and API keys.
+#     llm_choice: 'OpenAI GPT-4o', 'Groq (Mixtral)', or 'Gemini Pro'
+#     Returns: LLM response as string
+#     """
+
+#     # ✅ OpenAI GPT-4o
+#     if llm_choice.startswith("OpenAI"):
+#         try:
+#             client = openai.OpenAI(api_key=api_keys.get("openai"))
+#             response = client.chat.completions.create(
+#                 model="gpt-4o",
+#                 messages=[{"role": "user", "content": prompt}],
+#                 max_tokens=600,
+#                 temperature=0.2,
+#             )
+#             return response.choices[0].message.content.strip()
+#         except Exception as e:
+#             return f"OpenAI Error: {str(e)}"
+
+#     # ✅ Gemini Pro (Google Generative AI)
+#     elif llm_choice.startswith("Gemini"):
+#         try:
+#             genai.configure(api_key=api_keys.get("gemini"))
+#             model = genai.GenerativeModel(model_name="models/gemini-pro")  # ✅ CORRECTED LINE
+#             response = model.generate_content(prompt)
+#             return response.text.strip()
+#         except Exception as e:
+#             return f"Gemini Error: {str(e)}"
+
+#     # 🔧 TODO: Add Groq here when you're ready
+#     # elif llm_choice.startswith("Groq"):
+#     #     ...
+
+#     # 🪂 Fallback if no LLM worked
+#     return (
+#         "Education Score: 0\nEducation Reasoning: Not evaluated.\nEducation Suggestions: N/A\n"
+#         "Skills Score: 0\nSkills Reasoning: Not evaluated.\nSkills Suggestions: N/A\n"
+#         "Experience Score: 0\nExperience Reasoning: Not evaluated.\nExperience Suggestions: N/A\n"
+#         "Final Score: 0\nOverall Explanation: No LLM response."
+#     )
+
+
+#real one
+
+# Handles LLM selection, API auth, and querying
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import telemetry
+from .cache import get_cache, make_key
+from .rate_limit import RateLimiter
+from .router import LLMRouter
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+MAX_TOKENS = 600
+TEMPERATURE = 0.2
+
+REQUEST_TIMEOUT = float(os.getenv("ATS_LLM_TIMEOUT", "60"))
+MAX_RETRIES = int(os.getenv("ATS_LLM_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 20.0
+DEFAULT_ASYNC_CONCURRENCY = 8
+HEDGE_REQUESTS = os.getenv("ATS_LLM_HEDGE", "1") == "1"
+
+FALLBACK_RESPONSE = (
+    "Education Score: 0\nEducation Reasoning: Not evaluated.\nEducation Suggestions: N/A\n"
+    "Skills Score: 0\nSkills Reasoning: Not evaluated.\nSkills Suggestions: N/A\n"
+    "Experience Score: 0\nExperience Reasoning: Not evaluated.\nExperience Suggestions: N/A\n"
+    "Final Score: 0\nOverall Explanation: No LLM response."
+)
+
+# Long-lived clients keyed by (provider, api key, base url), so every call reuses
+# the same HTTP connection pool instead of paying a new connection and TLS handshake.
+# An async client's pool belongs to the event loop it was first used on (a later asyncio.run() would fail
+# with "Event loop is closed"), so async clients are kept per running loop and dropped with it.
+_clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, Optional[str], Optional[str]], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+def get_client(provider: str, api_key: Optional[str], base_url: Optional[str] = None, asynchronous: bool = False) -> Any:
+    """
+    Return the shared OpenAI-compatible client for provider/api_key/base_url, creating it on first use.
+    base_url points the client at any OpenAI-compatible endpoint (e.g. a local stub server).
+    Retries are handled by this module, so the SDK's own retries are disabled.
+    asynchronous=True must be called from a coroutine: the client is shared only within its event loop.
+    """
+    key = (provider, api_key, base_url)
+    with _clients_lock:
+        clients = _async_clients.setdefault(asyncio.get_running_loop(), {}) if asynchronous else _clients
+        client = clients.get(key)
+        if client is None:
+            # Imported on first use: the SDK takes most of a second to load and the app may never need it
+            import openai
+            client_cls = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+            client = client_cls(api_key=api_key, base_url=base_url, timeout=REQUEST_TIMEOUT, max_retries=0)
+            clients[key] = client
+        return client
+
+class LLMProvider(ABC):
+    """
+    Interface for an LLM backend.
+    Subclasses set `name` and `model` and implement complete(); acomplete() defaults to
+    running complete() in a worker thread and stream() to yielding the whole completion at once.
+    json_mode=True asks the backend to constrain its output to a JSON object.
+    """
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    def complete(self, prompt: str, json_mode: bool = False) -> str:
+        """Return the completion of prompt as text."""
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield self.complete(prompt)
+
+    async def acomplete(self, prompt: str, json_mode: bool = False) -> str:
+        return await asyncio.to_thread(self.complete, prompt, json_mode)
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any backend speaking the OpenAI chat-completions API."""
+    def __init__(self, name: str, model: str, api_key: Optional[str], base_url: Optional[str] = None):
+        self.name = name
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def complete(self, prompt: str, json_mode: bool = False) -> str:
+        client = get_client(self.name, self.api_key, self.base_url)
+        response = client.chat.completions.create(**_chat_request(self.model, prompt, json_mode))
+        self._record_usage(response)
+        return response.choices[0].message.content
+
+    async def acomplete(self, prompt: str, json_mode: bool = False) -> str:
+        client = get_client(self.name, self.api_key, self.base_url, asynchronous=True)
+        response = await client.chat.completions.create(**_chat_request(self.model, prompt, json_mode))
+        self._record_usage(response)
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        client = get_client(self.name, self.api_key, self.base_url)
+        for event in client.chat.completions.create(**_chat_request(self.model, prompt), stream=True):
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            record_usage(self.name, usage.prompt_tokens, usage.completion_tokens)
+
+class OpenAIProvider(OpenAICompatibleProvider):
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, model: str = OPENAI_MODEL):
+        super().__init__("openai", model, api_key, base_url)
+
+class GroqProvider(OpenAICompatibleProvider):
+    # Groq serves an OpenAI-compatible endpoint, so it shares the pooled client and retry handling
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, model: str = GROQ_MODEL):
+        super().__init__("groq", model, api_key, base_url or GROQ_BASE_URL)
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, model: str = GEMINI_MODEL):
+        import google.generativeai as genai
+        from google.ai import generativelanguage as glm
+        self.model = model
+        self._client_options = {"api_key": api_key}
+        self._model = genai.GenerativeModel(
+            model_name=model,
+            generation_config={"temperature": TEMPERATURE, "max_output_tokens": MAX_TOKENS},
+        )
+        # genai.configure() sets one process-global key that every model picks up lazily on its first call,
+        # so two keys (e.g. two app sessions) would end up sharing the last one. Models only fall back to
+        # that global client while their own is unset, so each provider gets clients built from its key.
+        self._model._client = glm.GenerativeServiceClient(client_options=self._client_options)
+
+    def complete(self, prompt: str, json_mode: bool = False) -> str:
+        response = self._model.generate_content(prompt, generation_config=self._generation_config(json_mode))
+        self._record_usage(response)
+        return response.text
+
+    async def acomplete(self, prompt: str, json_mode: bool = False) -> str:
+        if self._model._async_client is None:
+            from google.ai import generativelanguage as glm
+            # Created inside the running loop, like the SDK's own default async client
+            self._model._async_client = glm.GenerativeServiceAsyncClient(client_options=self._client_options)
+        response = await self._model.generate_content_async(prompt, generation_config=self._generation_config(json_mode))
+        self._record_usage(response)
+        return response.text
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record_usage(self.name, usage.prompt_token_count, usage.candidates_token_count)
+
+    @staticmethod
+    def _generation_config(json_mode: bool) -> Optional[Dict[str, Any]]:
+        # Merged into the model's own generation_config
+        return {"response_mime_type": "application/json"} if json_mode else None
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._model.generate_content(prompt, stream=True):
+            yield chunk.text
+
+def record_usage(provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Count the token usage the API reported for one request (see modules.telemetry)."""
+    if prompt_tokens:
+        telemetry.count("llm_prompt_tokens", prompt_tokens, provider=provider)
+    if completion_tokens:
+        telemetry.count("llm_completion_tokens", completion_tokens, provider=provider)
+
+PROVIDER_CLASSES = {"openai": OpenAIProvider, "groq": GroqProvider, "gemini": GeminiProvider}
+
+def provider_name(llm_choice: str) -> Optional[str]:
+    """Map a UI label such as 'OpenAI gpt-3.5-turbo', 'Auto (fastest available)' or 'Local (no LLM)' to a provider name."""
+    for prefix, name in (("OpenAI", "openai"), ("Groq", "groq"), ("Gemini", "gemini"), ("Auto", "auto"), ("Local", "local")):
+        if llm_choice.startswith(prefix):
+            return name
+    return None
+
+def is_configured(llm_choice: str, api_keys: Dict[str, str]) -> bool:
+    """True when llm_choice names a real provider (or 'Auto') and a matching API key is available."""
+    name = provider_name(llm_choice)
+    if name == "auto":
+        return any(api_keys.get(n) for n in PROVIDER_CLASSES)
+    return name in PROVIDER_CLASSES and bool(api_keys.get(name))
+
+_providers: Dict[Tuple[str, Optional[str], Optional[str]], LLMProvider] = {}
+_providers_lock = threading.Lock()
+
+def get_provider(name: str, api_keys: Dict[str, str]) -> LLMProvider:
+    """Shared provider instance for name and the matching key in api_keys ('<name>_base_url' overrides the endpoint)."""
+    api_key, base_url = api_keys.get(name), api_keys.get(f"{name}_base_url")
+    key = (name, api_key, base_url)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = PROVIDER_CLASSES[name](api_key, base_url)
+            _providers[key] = provider
+        return provider
+
+_routers: Dict[Tuple, LLMRouter] = {}
+_routers_lock = threading.Lock()
+
+def get_router(api_keys: Dict[str, str]) -> Optional[LLMRouter]:
+    """Router over every provider that has an API key; None when no key is set."""
+    names = [name for name in PROVIDER_CLASSES if api_keys.get(name)]
+    if not names:
+        return None
+    key = tuple((name, api_keys.get(name), api_keys.get(f"{name}_base_url")) for name in names)
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            providers = [get_provider(name, api_keys) for name in names]
+            # No retries inside the router: a failing provider is better answered by failing over
+            router = LLMRouter(providers, call=lambda p, prompt, **options: call_provider(p, prompt, max_retries=0, **options),
+                               hedge=HEDGE_REQUESTS)
+            _routers[key] = router
+        return router
+
+# Per-provider rate limits; configure from ATS_LLM_RPM / ATS_LLM_TPM or configure_rate_limit()
+_rate_limiters: Dict[str, RateLimiter] = {}
+
+def configure_rate_limit(provider: str, requests_per_minute: Optional[float] = None,
+                         tokens_per_minute: Optional[float] = None) -> RateLimiter:
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    _rate_limiters[provider] = limiter
+    return limiter
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        rpm = float(os.getenv("ATS_LLM_RPM", "0")) or None
+        tpm = float(os.getenv("ATS_LLM_TPM", "0")) or None
+        limiter = _rate_limiters.setdefault(provider, RateLimiter(rpm, tpm))
+    return limiter
+
+def estimate_request_tokens(prompt: str, max_tokens: int = MAX_TOKENS) -> int:
+    # ~4 characters per token for English text, plus the completion budget
+    return len(prompt) // 4 + max_tokens
+
+def _is_retryable(error: Exception) -> bool:
+    # An openai error can only exist once get_client has imported the SDK
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(error, openai.APIConnectionError):  # includes timeouts
+        return True
+    if openai is not None and isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    # google.api_core errors carry the HTTP status as `code`
+    return getattr(error, "code", None) in (429, 500, 502, 503, 504)
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Exponential backoff with full jitter; a Retry-After header from the server takes precedence."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            return min(float(headers.get("retry-after")), RETRY_MAX_DELAY)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+def _chat_request(model: str, prompt: str, json_mode: bool = False) -> Dict[str, Any]:
+    request = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE,
+    }
+    if json_mode:
+        request["response_format"] = {"type": "json_object"}
+    return request
+
+def call_provider(provider: LLMProvider, prompt: str, max_retries: int = MAX_RETRIES, json_mode: bool = False) -> str:
+    """provider.complete() under the provider's rate limit, retrying 429/5xx/connection errors."""
+    limiter = get_rate_limiter(provider.name)
+    for attempt in range(max_retries + 1):
+        limiter.acquire(estimate_request_tokens(prompt))
+        telemetry.count("llm_requests", provider=provider.name)
+        try:
+            return provider.complete(prompt, json_mode)
+        except Exception as e:
+            if attempt == max_retries or not _is_retryable(e):
+                telemetry.count("llm_errors", provider=provider.name)
+                raise
+            telemetry.count("llm_retries", provider=provider.name)
+            time.sleep(_retry_delay(e, attempt))
+
+def stream_provider(provider: LLMProvider, prompt: str, max_retries: int = MAX_RETRIES) -> Iterator[str]:
+    """
+    provider.stream() under the provider's rate limit. Retries only happen before the first chunk
+    arrives; once text has been yielded a failure is raised to the caller.
+    """
+    limiter = get_rate_limiter(provider.name)
+    with telemetry.span("llm.first_chunk", provider=provider.name):
+        for attempt in range(max_retries + 1):
+            limiter.acquire(estimate_request_tokens(prompt))
+            telemetry.count("llm_requests", provider=provider.name)
+            try:
+                chunks = iter(provider.stream(prompt))
+                first = next(chunks, None)
+                break
+            except Exception as e:
+                if attempt == max_retries or not _is_retryable(e):
+                    telemetry.count("llm_errors", provider=provider.name)
+                    raise
+                telemetry.count("llm_retries", provider=provider.name)
+                time.sleep(_retry_delay(e, attempt))
+    if first is not None:
+        yield first
+    yield from chunks
+
+async def acall_provider(provider: LLMProvider, prompt: str, max_retries: int = MAX_RETRIES, json_mode: bool = False) -> str:
+    """asyncio counterpart of call_provider."""
+    limiter = get_rate_limiter(provider.name)
+    for attempt in range(max_retries + 1):
+        await limiter.aacquire(estimate_request_tokens(prompt))
+        telemetry.count("llm_requests", provider=provider.name)
+        try:
+            return await provider.acomplete(prompt, json_mode)
+        except Exception as e:
+            if attempt == max_retries or not _is_retryable(e):
+                telemetry.count("llm_errors", provider=provider.name)
+                raise
+            telemetry.count("llm_retries", provider=provider.name)
+            await asyncio.sleep(_retry_delay(e, attempt))
+
+def _cache_model(name: str, api_keys: Dict[str, str], json_mode: bool = False) -> str:
+    model = "auto" if name == "auto" else f"{name}:{get_provider(name, api_keys).model}"
+    return f"{model}:json" if json_mode else model
+
+def model_id(llm_choice: str, api_keys: Dict[str, str]) -> str:
+    """Identifier of what scores with llm_choice: '<provider>:<model>', 'auto', or 'local' when no LLM is configured."""
+    if not is_configured(llm_choice, api_keys):
+        return "local"
+    return _cache_model(provider_name(llm_choice), api_keys)
+
+def query_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str], use_cache: bool = True,
+              stream: bool = False, json_mode: bool = False) -> Union[str, Iterator[str]]:
+    """
+    Query the selected LLM with the given prompt and API keys.
+    llm_choice: 'OpenAI ...', 'Groq ...', 'Gemini ...' or 'Auto ...' (route to the fastest provider with a key)
+    api_keys: dict with possible keys: 'openai', 'groq', 'gemini' (and '<provider>_base_url' for a custom endpoint)
+    use_cache: look up / store the response in the shared response cache (see modules.cache)
+    stream: return an iterator of text chunks as they are generated instead of the full string
+    json_mode: request a JSON object response (OpenAI/Groq response_format, Gemini response_mime_type); not streamed
+    Returns: LLM response as string (or iterator of chunks when stream=True)
+    """
+    if stream and not json_mode:
+        return _stream_llm(llm_choice, prompt, api_keys, use_cache)
+    name = provider_name(llm_choice)
+    router = get_router(api_keys) if name == "auto" else None
+    if name in (None, "local") or (name == "auto" and router is None):
+        content = FALLBACK_RESPONSE
+    else:
+        content = _complete_llm(name, router, prompt, api_keys, use_cache, json_mode)
+    return iter([content]) if stream else content
+
+def _complete_llm(name: str, router: Optional[LLMRouter], prompt: str, api_keys: Dict[str, str],
+                  use_cache: bool, json_mode: bool) -> str:
+    with telemetry.span("llm.query", provider=name, json_mode=json_mode) as span:
+        cache = get_cache()
+        key = make_key(_cache_model(name, api_keys, json_mode), prompt, TEMPERATURE, MAX_TOKENS)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                span.set(cached=True)
+                return cached
+        if router is not None:
+            content = router.complete(prompt, json_mode=json_mode)
+        else:
+            content = call_provider(get_provider(name, api_keys), prompt, json_mode=json_mode)
+        if use_cache and content:
+            cache.set(key, content)
+        return content
+
+def _stream_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str], use_cache: bool) -> Iterator[str]:
+    name = provider_name(llm_choice)
+    router = get_router(api_keys) if name == "auto" else None
+    if name in (None, "local") or (name == "auto" and router is None):
+        yield FALLBACK_RESPONSE
+        return
+    cache = get_cache()
+    key = make_key(_cache_model(name, api_keys), prompt, TEMPERATURE, MAX_TOKENS)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    chunks: List[str] = []
+    if router is not None:
+        # Routed (and possibly hedged) calls are not streamed; the answer arrives as one chunk
+        chunks.append(router.complete(prompt))
+        yield chunks[0]
+    else:
+        for chunk in stream_provider(get_provider(name, api_keys), prompt):
+            chunks.append(chunk)
+            yield chunk
+    content = "".join(chunks)
+    if use_cache and content:
+        cache.set(key, content)
+
+async def aquery_llm(llm_choice: str, prompt: str, api_keys: Dict[str, str], use_cache: bool = True,
+                     json_mode: bool = False) -> str:
+    """asyncio variant of query_llm: same caching, pooled async clients, rate limiting and retries."""
+    name = provider_name(llm_choice)
+    if name in (None, "local"):
+        return FALLBACK_RESPONSE
+    if name == "auto":
+        # The router hedges on threads, so run it off the event loop
+        return await asyncio.to_thread(query_llm, llm_choice, prompt, api_keys, use_cache, False, json_mode)
+    cache = get_cache()
+    key = make_key(_cache_model(name, api_keys, json_mode), prompt, TEMPERATURE, MAX_TOKENS)
+    if use_cache:
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
+    content = await acall_provider(get_provider(name, api_keys), prompt, json_mode=json_mode)
+    if use_cache and content:
+        await cache.aset(key, content)
+    return content
+
+async def aquery_many(llm_choice: str, prompts: Sequence[str], api_keys: Dict[str, str], use_cache: bool = True,
+                      concurrency: int = DEFAULT_ASYNC_CONCURRENCY, return_exceptions: bool = False,
+                      json_mode: bool = False) -> List[Any]:
+    """
+    Run aquery_llm for every prompt with at most `concurrency` requests in flight.
+    Results are returned in prompt order; with return_exceptions=True failed prompts yield their exception.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(prompt: str) -> str:
+        async with semaphore:
+            return await aquery_llm(llm_choice, prompt, api_keys, use_cache=use_cache, json_mode=json_mode)
+
+    return await asyncio.gather(*(run(p) for p in prompts), return_exceptions=return_exceptions)
@@ -1,19 +1,187 @@
-import pypdf
-import docx2txt
-import tempfile
-from typing import Any
-
-# Extracts raw text from PDF or DOCX resumes
-def extract_text(uploaded_file: Any) -> str:
-    if uploaded_file.name.lower().endswith('.pdf'):
-        reader = pypdf.PdfReader(uploaded_file)
-        return "\n".join(page.extract_text() or '' for page in reader.pages)
-    elif uploaded_file.name.lower().endswith('.docx'):
-        # docx2txt expects a file path
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            tmp.write(uploaded_file.read())
-            tmp.flush()
-            text = docx2txt.process(tmp.name)
-        return text
-    else:
-        return ""
+import hashlib
+import io
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import telemetry
+
+# Per-file limits, so one pathological upload cannot stall a worker
+MAX_FILE_BYTES = int(os.getenv("ATS_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+MAX_PAGES = int(os.getenv("ATS_MAX_PAGES", "30"))  # later pages are ignored
+EXTRACTION_TIMEOUT = float(os.getenv("ATS_EXTRACTION_TIMEOUT", "30"))  # 0 disables the limit
+
+# PDFs under POOL_PAGE_THRESHOLD pages and POOL_BYTES_THRESHOLD bytes are extracted in this process, checking the
+# timeout between pages. With a timeout, bigger ones go to a process pool whose workers can be killed when a page
+# overruns. PDFs with at least PARALLEL_PAGE_THRESHOLD pages are split into chunks across the pool.
+POOL_PAGE_THRESHOLD = 8
+POOL_BYTES_THRESHOLD = 1024 * 1024
+PARALLEL_PAGE_THRESHOLD = 12
+PAGES_PER_CHUNK = 4
+CACHE_ENTRIES = 1024
+
+class ExtractionError(ValueError):
+    """Raised when a file exceeds the extraction limits or cannot be read."""
+
+# Extracted text keyed by (SHA-256 of the file bytes, max_pages), so re-uploads and duplicates are free
+_text_cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+_inflight: Dict[Tuple[str, int], Future] = {}
+_cache_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Worker PIDs reported by each pool's initializer, so an overrunning worker can be killed
+_worker_pids: Dict[ProcessPoolExecutor, Any] = {}
+
+# Extracts raw text from PDF or DOCX resumes
+def extract_text(uploaded_file: Any) -> str:
+    name = uploaded_file.name.lower()
+    if not name.endswith(('.pdf', '.docx')):
+        return ""
+    return extract_bytes(uploaded_file.name, read_bytes(uploaded_file))
+
+@telemetry.traced("parser.extract_text")
+def extract_bytes(filename: str, data: bytes, max_pages: int = MAX_PAGES, max_bytes: int = MAX_FILE_BYTES,
+                  timeout: Optional[float] = EXTRACTION_TIMEOUT) -> str:
+    """
+    Extract text from the bytes of a PDF or DOCX file.
+    Results are cached by content hash and max_pages; concurrent requests for the same bytes share one extraction.
+    Raises ExtractionError when the file is larger than max_bytes or a PDF takes longer than timeout seconds
+    (None or 0: no limit). Small PDFs are checked between pages; see POOL_PAGE_THRESHOLD.
+    """
+    if len(data) > max_bytes:
+        raise ExtractionError(f"{filename}: {len(data)} bytes exceeds the {max_bytes} byte limit")
+    key = (hashlib.sha256(data).hexdigest(), max_pages)
+    with _cache_lock:
+        if key in _text_cache:
+            _text_cache.move_to_end(key)
+            telemetry.count("parser_cache_hits")
+            return _text_cache[key]
+        pending = _inflight.get(key)
+        if pending is None:
+            _inflight[key] = future = Future()
+    if pending is not None:
+        return pending.result()
+    try:
+        if filename.lower().endswith('.pdf'):
+            text = _extract_pdf(data, max_pages, time.monotonic() + timeout if timeout else None)
+        elif filename.lower().endswith('.docx'):
+            text = _extract_docx(data)
+        else:
+            text = ""
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _cache_lock:
+            _inflight.pop(key, None)
+    future.set_result(text)
+    with _cache_lock:
+        _text_cache[key] = text
+        while len(_text_cache) > CACHE_ENTRIES:
+            _text_cache.popitem(last=False)
+    return text
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _text_cache.clear()
+
+def read_bytes(uploaded_file: Any) -> bytes:
+    if hasattr(uploaded_file, 'getvalue'):  # Streamlit UploadedFile / BytesIO
+        return uploaded_file.getvalue()
+    if hasattr(uploaded_file, 'seek'):
+        uploaded_file.seek(0)
+    return uploaded_file.read()
+
+# pypdf and docx2txt are imported by the extractors, so importing this module stays cheap
+
+def _extract_docx(data: bytes) -> str:
+    import docx2txt
+    # docx2txt only needs a zip file object, so the upload never touches the disk
+    return docx2txt.process(io.BytesIO(data))
+
+def _extract_pdf(data: bytes, max_pages: int, deadline: Optional[float]) -> str:
+    import pypdf
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        page_count = min(len(reader.pages), max_pages)
+    except Exception as e:
+        raise ExtractionError(f"Unreadable PDF: {e}") from e
+    small = page_count < POOL_PAGE_THRESHOLD and len(data) < POOL_BYTES_THRESHOLD
+    if page_count < PARALLEL_PAGE_THRESHOLD and (deadline is None or small):
+        texts = []
+        for page in reader.pages[:page_count]:
+            if deadline is not None and time.monotonic() > deadline:
+                raise ExtractionError("PDF extraction timed out")
+            texts.append(page.extract_text() or '')
+        return "\n".join(texts)
+    if page_count < PARALLEL_PAGE_THRESHOLD:
+        # A single page can take arbitrarily long, so the deadline is only strictly enforceable in a killable worker
+        ranges = [(0, page_count)]
+    else:
+        ranges = [(start, min(start + PAGES_PER_CHUNK, page_count)) for start in range(0, page_count, PAGES_PER_CHUNK)]
+    try:
+        texts = _extract_in_pool(data, ranges, deadline)
+    except BrokenProcessPool:
+        # Another file's overrun recycled the pool while these chunks were queued on it
+        texts = _extract_in_pool(data, ranges, deadline)
+    return "\n".join(texts)
+
+def _extract_in_pool(data: bytes, ranges: Sequence[Tuple[int, int]], deadline: Optional[float]) -> List[str]:
+    pool = _get_pool()
+    futures = [pool.submit(_extract_pdf_pages, data, start, stop) for start, stop in ranges]
+    texts: List[str] = []
+    try:
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            texts.extend(future.result(timeout=remaining))
+    except FuturesTimeout:
+        # cancel() cannot stop chunks that are already running; kill the workers so later files do not queue behind them
+        _recycle_pool(pool)
+        raise ExtractionError("PDF extraction timed out")
+    return texts
+
+def _extract_pdf_pages(data: bytes, start: int, stop: int) -> List[str]:
+    # Runs in a worker process
+    import pypdf
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+def _register_worker(pids: Any) -> None:
+    # Runs in each worker process as it starts
+    pids.put(os.getpid())
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pids = multiprocessing.Queue()
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2, initializer=_register_worker, initargs=(pids,))
+            _worker_pids[_pool] = pids
+        return _pool
+
+def _recycle_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill the pool's worker processes and let the next extraction start a fresh pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        pids = _worker_pids.pop(pool, None)
+    pool.shutdown(wait=False, cancel_futures=True)
+    while pids is not None:
+        try:
+            pid = pids.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+        except OSError:
+            pass  # already exited
+    if pids is not None:
+        pids.close()
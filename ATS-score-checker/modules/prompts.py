@@ -0,0 +1,52 @@
+# Prompt templates for LLM scoring
+
+ATS_SCORING_PROMPT = '''Given the following resume and job description, evaluate the candidate in these areas:
+- Education (score 0-100)
+- Skills (score 0-100)
+- Experience (score 0-100)
+
+For each section, provide:
+- Score
+- Reasoning
+- Suggestions to improve
+
+At the end, provide a weighted final score (Education 25%, Skills 40%, Experience 35%).
+
+IMPORTANT: ONLY output the following fields, in exactly this format, with NO extra commentary or text. Do not add explanations before or after. Do not use markdown or bullet points. Use numbers only for scores.
+
+Job Description:
+{job_description}
+
+Resume:
+{resume_text}
+
+Respond with:
+Education Score: <number>
+Education Reasoning: <text>
+Education Suggestions: <text>
+Skills Score: <number>
+Skills Reasoning: <text>
+Skills Suggestions: <text>
+Experience Score: <number>
+Experience Reasoning: <text>
+Experience Suggestions: <text>
+Final Score: <number>
+Overall Explanation: <text>
+'''
+
+# Same instructions, answered as a JSON object keyed like the score_resume() result
+ATS_SCORING_JSON_PROMPT = ATS_SCORING_PROMPT.split("Respond with:")[0] + '''Respond with a single JSON object with exactly these keys (scores are integers from 0 to 100, all other values are plain text):
+{{"education_score": <number>, "education_reasoning": "<text>", "education_suggestions": "<text>", "skills_score": <number>, "skills_reasoning": "<text>", "skills_suggestions": "<text>", "experience_score": <number>, "experience_reasoning": "<text>", "experience_suggestions": "<text>", "final_score": <number>, "overall_explanation": "<text>"}}
+'''
+
+# Follow-up for the fields a scoring answer left out or got wrong. Only the context those fields need is
+# sent (key requirements, the matching resume sections, the scores already given), not the whole scoring prompt
+FIELD_REPAIR_PROMPT = '''You are completing an ATS evaluation of a resume against a job description (final score weighting: Education 25%, Skills 40%, Experience 35%).
+
+Key job requirements:
+{requirements}
+
+{resume_sections}Scores already given: {answer}
+
+Respond with a single JSON object containing ONLY these keys: {fields}. Scores are integers from 0 to 100, all other values are plain text. No extra commentary.
+'''
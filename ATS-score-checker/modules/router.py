@@ -0,0 +1,183 @@
+# Latency-aware routing across LLM providers, with optional hedged requests
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from . import telemetry
+
+DEFAULT_WINDOW = 100
+DEFAULT_MIN_SAMPLES = 3
+DEFAULT_MAX_ERROR_RATE = 0.5
+# Seconds after which an unhealthy provider gets one request again, to find out whether it recovered
+DEFAULT_PROBE_INTERVAL = 30.0
+
+class ProviderStats:
+    """Rolling latency and error-rate window for one provider."""
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._latencies: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.last_call = 0.0  # time.monotonic() of the last recorded call
+
+    def record(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(latency)
+            self.last_call = time.monotonic()
+
+    def clear_outcomes(self) -> None:
+        """Forget past successes and failures (latencies are kept), so the error rate is measured afresh."""
+        with self._lock:
+            self._outcomes.clear()
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return 1 - sum(self._outcomes) / len(self._outcomes)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+class LLMRouter:
+    """
+    Sends each prompt to the fastest healthy provider (lowest rolling p50).
+    Providers with fewer than min_samples calls are tried first so every provider gets measured;
+    providers whose error rate exceeds max_error_rate are only used as a last resort. Since only the first
+    working provider is called, an unhealthy one gets a single probe request once it has not been called for
+    probe_interval seconds; if the probe succeeds its error window is cleared and it is measured again.
+    With hedge=True, a second request goes to the next provider once the first one has run
+    longer than its own p95, and whichever answers first wins.
+    providers: objects with a `name` attribute; call(provider, prompt, **options) performs the request
+    (defaults to provider.complete(prompt, **options)); options are the keyword arguments given to complete().
+    """
+    def __init__(self, providers: Sequence[Any], call: Optional[Callable[..., str]] = None,
+                 hedge: bool = False, max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, window: int = DEFAULT_WINDOW, max_workers: int = 16,
+                 probe_interval: float = DEFAULT_PROBE_INTERVAL):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = list(providers)
+        self.call = call or (lambda provider, prompt, **options: provider.complete(prompt, **options))
+        self.hedge = hedge
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.stats: Dict[str, ProviderStats] = {p.name: ProviderStats(window) for p in self.providers}
+        self._last_probe: Dict[str, float] = {}
+        self._probe_lock = threading.Lock()
+        # Hedged requests keep running after losing, so they need their own threads
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-hedge")
+
+    def is_healthy(self, provider: Any) -> bool:
+        stats = self.stats[provider.name]
+        return stats.samples < self.min_samples or stats.error_rate <= self.max_error_rate
+
+    def ranked(self) -> List[Any]:
+        def sort_key(provider: Any):
+            stats = self.stats[provider.name]
+            measured = stats.samples >= self.min_samples
+            return (not self.is_healthy(provider), measured, stats.p50 or 0.0)
+        return sorted(self.providers, key=sort_key)
+
+    def complete(self, prompt: str, **options: Any) -> str:
+        order = self.ranked()
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        probe = self._claim_probe()
+        if probe is not None:
+            tried.add(probe.name)
+            try:
+                result = self._timed(probe, prompt, options)
+            except Exception as e:
+                last_error = e
+            else:
+                self.stats[probe.name].clear_outcomes()
+                return result
+        if self.hedge and len(order) > 1 and self.stats[order[0].name].p95 is not None:
+            try:
+                return self._hedged(order[0], order[1], prompt, tried, options)
+            except Exception as e:
+                last_error = e
+        for provider in order:
+            if provider.name in tried:
+                continue
+            try:
+                return self._timed(provider, prompt, options)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Current per-provider stats, fastest first; handy for dashboards and debugging."""
+        return [
+            {
+                'provider': p.name,
+                'p50': self.stats[p.name].p50,
+                'p95': self.stats[p.name].p95,
+                'error_rate': self.stats[p.name].error_rate,
+                'samples': self.stats[p.name].samples,
+                'healthy': self.is_healthy(p),
+            }
+            for p in self.ranked()
+        ]
+
+    def _claim_probe(self) -> Optional[Any]:
+        """An unhealthy provider not called for probe_interval seconds, claimed so only one request probes it."""
+        now = time.monotonic()
+        with self._probe_lock:
+            for provider in self.providers:
+                last = max(self.stats[provider.name].last_call, self._last_probe.get(provider.name, 0.0))
+                if now - last >= self.probe_interval and not self.is_healthy(provider):
+                    self._last_probe[provider.name] = now
+                    return provider
+        return None
+
+    def _timed(self, provider: Any, prompt: str, options: Dict[str, Any]) -> str:
+        start = time.monotonic()
+        try:
+            result = self.call(provider, prompt, **options)
+        except Exception:
+            self.stats[provider.name].record(time.monotonic() - start, ok=False)
+            raise
+        self.stats[provider.name].record(time.monotonic() - start, ok=True)
+        return result
+
+    def _hedged(self, primary: Any, backup: Any, prompt: str, tried: Set[str], options: Dict[str, Any]) -> str:
+        tried.add(primary.name)
+        timed = telemetry.bind_run(self._timed)  # the calls' spans belong to the caller's run
+        first = self._pool.submit(timed, primary, prompt, options)
+        try:
+            return first.result(timeout=self.stats[primary.name].p95)
+        except FuturesTimeout:
+            pass
+        tried.add(backup.name)
+        pending = {first, self._pool.submit(timed, backup, prompt, options)}
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
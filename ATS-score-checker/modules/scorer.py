@@ -1,98 +1,470 @@
-from .llm_handler import query_llm
-from typing import Dict, Any
-import re
-
-ATS_SCORING_PROMPT = '''Given the following resume and job description, evaluate the candidate in these areas:
-- Education (score 0-100)
-- Skills (score 0-100)
-- Experience (score 0-100)
-
-For each section, provide:
-- Score
-- Reasoning
-- Suggestions to improve
-
-At the end, provide a weighted final score (Education 25%, Skills 40%, Experience 35%).
-
-IMPORTANT: ONLY output the following fields, in exactly this format, with NO extra commentary or text. Do not add explanations before or after. Do not use markdown or bullet points. Use numbers only for scores.
-
-Job Description:
-{job_description}
-
-Resume:
-{resume_text}
-
-Respond with:
-Education Score: <number>
-Education Reasoning: <text>
-Education Suggestions: <text>
-Skills Score: <number>
-Skills Reasoning: <text>
-Skills Suggestions: <text>
-Experience Score: <number>
-Experience Reasoning: <text>
-Experience Suggestions: <text>
-Final Score: <number>
-Overall Explanation: <text>
-'''
-
-def score_resume(resume_text: str, job_description: str, llm_choice: str, api_keys: Dict[str, str]) -> Dict[str, Any]:
-    prompt = ATS_SCORING_PROMPT.format(job_description=job_description, resume_text=resume_text)
-    response = query_llm(llm_choice, prompt, api_keys)
-
-    result = {
-        'education_score': 0,
-        'education_reasoning': '',
-        'education_suggestions': '',
-        'skills_score': 0,
-        'skills_reasoning': '',
-        'skills_suggestions': '',
-        'experience_score': 0,
-        'experience_reasoning': '',
-        'experience_suggestions': '',
-        'final_score': 0,
-        'overall_explanation': ''
-    }
-
-    if not response or "Error" in response:
-        result['overall_explanation'] = f"LLM error or empty response.\n\n[DEBUG: Raw LLM output]\n{response}"
-        return result
-
-    try:
-        # Clean up and parse each line
-        lines = [line.strip() for line in response.splitlines() if line.strip()]
-        for line in lines:
-            key = line.lower().replace(" ", "").split(":")[0]
-            value = line.partition(":")[2].strip()
-
-            if key == "educationscore":
-                result["education_score"] = int(re.findall(r"\d+", value)[0]) if re.findall(r"\d+", value) else 0
-            elif key == "educationreasoning":
-                result["education_reasoning"] = value
-            elif key == "educationsuggestions":
-                result["education_suggestions"] = value
-            elif key == "skillsscore":
-                result["skills_score"] = int(re.findall(r"\d+", value)[0]) if re.findall(r"\d+", value) else 0
-            elif key == "skillsreasoning":
-                result["skills_reasoning"] = value
-            elif key == "skillssuggestions":
-                result["skills_suggestions"] = value
-            elif key == "experiencescore":
-                result["experience_score"] = int(re.findall(r"\d+", value)[0]) if re.findall(r"\d+", value) else 0
-            elif key == "experiencereasoning":
-                result["experience_reasoning"] = value
-            elif key == "experiencesuggestions":
-                result["experience_suggestions"] = value
-            elif key == "finalscore":
-                result["final_score"] = int(re.findall(r"\d+", value)[0]) if re.findall(r"\d+", value) else 0
-            elif key == "overallexplanation":
-                result["overall_explanation"] = value
-
-        # If still all scores are 0, something went wrong with parsing
-        if all(result[k] == 0 for k in ['education_score', 'skills_score', 'experience_score', 'final_score']):
-            result['overall_explanation'] += f"\n\n[DEBUG: Raw LLM output]\n{response}"
-
-    except Exception as e:
-        result['overall_explanation'] = f"Exception during parsing: {str(e)}\n\n[DEBUG: Raw LLM output]\n{response}"
-
-    return result
+from . import telemetry
+from .compaction import compact_resume, estimate_tokens, normalize_whitespace, strip_repeated_lines, truncate_to_budget
+from .llm_handler import is_configured, query_llm
+from .job_profile import JobProfile, get_job_profile
+from .prompts import ATS_SCORING_PROMPT, FIELD_REPAIR_PROMPT
+from .utils import extract_all_resume_skills, extract_skills_from_text, split_sections
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import re
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+SCORE_WEIGHTS = {'education': 0.25, 'skills': 0.40, 'experience': 0.35}
+
+def empty_result() -> Dict[str, Any]:
+    return {
+        'education_score': 0,
+        'education_reasoning': '',
+        'education_suggestions': '',
+        'skills_score': 0,
+        'skills_reasoning': '',
+        'skills_suggestions': '',
+        'experience_score': 0,
+        'experience_reasoning': '',
+        'experience_suggestions': '',
+        'final_score': 0,
+        'overall_explanation': ''
+    }
+
+def build_scoring_prompt(resume_text: str, profile: JobProfile, compact: bool = True,
+                         section_budgets: Optional[Dict[str, int]] = None, structured: bool = False) -> str:
+    if not compact:
+        return profile.build_prompt(resume_text, structured=structured)
+    return profile.build_prompt(compact_resume(resume_text, section_budgets).text, compact=True, structured=structured)
+
+def weighted_final_score(result: Dict[str, Any]) -> int:
+    """Final score as the 25/40/35 weighting of the section scores."""
+    return int(round(sum(weight * result[f'{section}_score'] for section, weight in SCORE_WEIGHTS.items())))
+
+# Normalized "Field Name" of each response line -> result key
+RESPONSE_FIELDS = {
+    "educationscore": "education_score",
+    "educationreasoning": "education_reasoning",
+    "educationsuggestions": "education_suggestions",
+    "skillsscore": "skills_score",
+    "skillsreasoning": "skills_reasoning",
+    "skillssuggestions": "skills_suggestions",
+    "experiencescore": "experience_score",
+    "experiencereasoning": "experience_reasoning",
+    "experiencesuggestions": "experience_suggestions",
+    "finalscore": "final_score",
+    "overallexplanation": "overall_explanation",
+}
+SCORE_FIELDS = ('education_score', 'skills_score', 'experience_score', 'final_score')
+
+# Ask the LLM for structured (JSON) output by default; ATS_STRUCTURED_OUTPUT=0 goes back to the line format
+STRUCTURED_OUTPUT = os.getenv("ATS_STRUCTURED_OUTPUT", "1") != "0"
+# An LLM final score further than this from weighted_final_score() is replaced by the weighted value
+FINAL_SCORE_TOLERANCE = 2
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+def validate_field(field: str, value: Any) -> Optional[Any]:
+    """value coerced to the field's type (int 0-100 for scores, non-empty text otherwise), or None if it is invalid."""
+    if field in SCORE_FIELDS:
+        if isinstance(value, str):
+            number = _NUMBER_RE.search(value)
+            value = float(number.group()) if number else None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return int(round(value)) if 0 <= value <= 100 else None
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+def validate_response(data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Valid, type-coerced fields of a parsed response and the result keys that are missing or malformed."""
+    valid: Dict[str, Any] = {}
+    invalid: List[str] = []
+    for field in RESPONSE_FIELDS.values():
+        value = validate_field(field, data.get(field))
+        if value is None:
+            invalid.append(field)
+        else:
+            valid[field] = value
+    return valid, invalid
+
+def parse_response_line(line: str) -> Optional[Tuple[str, Any]]:
+    """(result key, value) for a valid "Field Name: value" line of the scoring response, or None for other lines."""
+    line = line.strip()
+    field = RESPONSE_FIELDS.get(line.lower().replace(" ", "").split(":")[0])
+    if field is None:
+        return None
+    value = validate_field(field, line.partition(":")[2])
+    return (field, value) if value is not None else None
+
+def iter_response_fields(chunks: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Parse streamed response text as it arrives: yields (result key, value) as soon as each line is complete."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            parsed = parse_response_line(line)
+            if parsed:
+                yield parsed
+    parsed = parse_response_line(buffer)
+    if parsed:
+        yield parsed
+
+def parse_json_response(response: str) -> Dict[str, Any]:
+    """
+    The JSON object in a response, keyed by result key ("Education Score" and "educationScore" are accepted too);
+    tolerates code fences or text around the object. Empty when there is no valid JSON object.
+    """
+    start, end = response.find("{"), response.rfind("}")
+    if start < 0 or end < start:
+        return {}
+    try:
+        data = json.loads(response[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {RESPONSE_FIELDS.get(str(k).lower().replace(" ", "").replace("_", ""), k): v for k, v in data.items()}
+
+def parse_response(response: str) -> Dict[str, Any]:
+    """Fields of a JSON or line-format scoring response, keyed by result key (values not yet validated)."""
+    return parse_json_response(response) or dict(iter_response_fields([response]))
+
+# Token budgets of the context sent with a field repair (see repair_fields)
+REPAIR_REQUIREMENTS_TOKENS = 250
+REPAIR_SECTION_TOKENS = 300
+
+def build_repair_prompt(resume_text: str, profile: JobProfile, valid: Dict[str, Any], fields: Sequence[str]) -> str:
+    """
+    FIELD_REPAIR_PROMPT for `fields`: the JD's key requirements, only the resume sections those fields
+    are about (overall_explanation needs none), and the scores already given, each trimmed to a token budget.
+    """
+    requirements = truncate_to_budget("\n".join(profile.requirements), REPAIR_REQUIREMENTS_TOKENS)
+    wanted_sections = {field.split('_')[0] for field in fields} & set(SCORE_WEIGHTS)
+    sections = split_sections(strip_repeated_lines(normalize_whitespace(resume_text))) if wanted_sections else {}
+    resume_sections = "".join(
+        f"Resume {section}:\n{truncate_to_budget(sections[section], REPAIR_SECTION_TOKENS) or '(none)'}\n\n"
+        for section in SCORE_WEIGHTS if section in wanted_sections
+    )
+    answer = json.dumps({field: valid[field] for field in SCORE_FIELDS if field in valid})
+    return FIELD_REPAIR_PROMPT.format(requirements=requirements, resume_sections=resume_sections, answer=answer,
+                                      fields=", ".join(fields))
+
+@telemetry.traced("scorer.repair_fields")
+def repair_fields(resume_text: str, profile: JobProfile, valid: Dict[str, Any], fields: Sequence[str], llm_choice: str,
+                  api_keys: Dict[str, str], use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Ask the LLM for just `fields` of an incomplete answer (a short prompt and JSON response instead of a whole
+    new evaluation, see build_repair_prompt). Returns the valid ones; a failed follow-up returns nothing
+    and leaves the answer as it was.
+    """
+    prompt = build_repair_prompt(resume_text, profile, valid, fields)
+    telemetry.count("score_repairs")
+    telemetry.count("score_repair_fields", len(fields))
+    try:
+        response = query_llm(llm_choice, prompt, api_keys, use_cache=use_cache, json_mode=True)
+    except Exception:
+        return {}
+    repaired, _ = validate_response(parse_response(response or ""))
+    return {field: repaired[field] for field in fields if field in repaired}
+
+def _new_llm_result(resume_text: str, profile: JobProfile, prompt: str, structured: bool) -> Dict[str, Any]:
+    result = empty_result()
+    result['error'] = ''  # set when the LLM gave no usable answer, so callers do not store the zeros as a score
+    result['missing_scores'] = list(SCORE_FIELDS)  # SCORE_FIELDS the answer did not provide (see _finish_result)
+    result['prompt_tokens_original'] = estimate_tokens(profile.build_prompt(resume_text, structured=structured))
+    result['prompt_tokens_compacted'] = estimate_tokens(prompt)
+    return result
+
+def _finish_result(result: Dict[str, Any], data: Dict[str, Any], response: str, resume_text: str, profile: JobProfile,
+                   llm_choice: str, api_keys: Dict[str, str], use_cache: bool) -> Dict[str, Any]:
+    """
+    Validate the parsed response into result: missing or malformed fields are requested again on their own,
+    and a final score that disagrees with the section scores is recomputed locally.
+    """
+    # Traced on its own: the repair round-trip below is a separate stage
+    with telemetry.span("scorer.validate_response"):
+        valid, invalid = validate_response(data)
+    if not valid:
+        telemetry.count("score_failures")
+        result['error'] = "LLM error or empty response"
+        result['overall_explanation'] = f"LLM error or empty response.\n\n[DEBUG: Raw LLM output]\n{response}"
+        return result
+    # final_score needs no follow-up: it is derived from the section scores below
+    wanted = [field for field in invalid if field != 'final_score']
+    if wanted:
+        valid.update(repair_fields(resume_text, profile, valid, wanted, llm_choice, api_keys, use_cache))
+    result.update(valid)
+
+    if all(f'{section}_score' in valid for section in SCORE_WEIGHTS):
+        expected = weighted_final_score(result)
+        reported = valid.get('final_score')
+        if reported is None or abs(reported - expected) > FINAL_SCORE_TOLERANCE:
+            result['final_score'] = expected
+            valid['final_score'] = expected
+            telemetry.count("final_score_corrections")
+            if reported is not None:
+                result['overall_explanation'] += (
+                    f"\n\n(Final score recomputed from the section scores with the 25/40/35 weighting; the model reported {reported}.)"
+                )
+    missing = [field for field in SCORE_FIELDS if field not in valid]
+    result['missing_scores'] = missing
+    if missing:
+        result['overall_explanation'] += f"\n\n[DEBUG: missing {', '.join(missing)}; raw LLM output]\n{response}"
+    # A section score left at 0 would pass for a real score, so the result counts as failed
+    unscored = [field for field in missing if field[:-len('_score')] in SCORE_WEIGHTS]
+    if unscored:
+        telemetry.count("score_failures")
+        result['error'] = f"LLM gave no valid {', '.join(unscored)}"
+    return result
+
+@telemetry.traced("scorer.score_resume")
+def score_resume(resume_text: str, job: Union[str, JobProfile], llm_choice: str, api_keys: Dict[str, str], use_cache: bool = True,
+                 compact: bool = True, section_budgets: Optional[Dict[str, int]] = None,
+                 structured: bool = STRUCTURED_OUTPUT) -> Dict[str, Any]:
+    """
+    Score a resume with the selected LLM.
+    job: job description text or a precompiled JobProfile (see modules.job_profile)
+    compact: send a compacted resume (see modules.compaction) trimmed to section_budgets tokens per section;
+    the estimated prompt size before and after is reported as prompt_tokens_original / prompt_tokens_compacted.
+    A non-empty 'error' in the result means the LLM gave no usable answer or left a section score out;
+    'missing_scores' lists the SCORE_FIELDS it did not provide (those are 0 in the result).
+    structured: ask for a JSON answer (ATS_SCORING_JSON_PROMPT) instead of "Field: value" lines.
+    Either way the answer is schema-checked; missing fields are requested again on their own (see repair_fields)
+    and final_score is checked against the 25/40/35 weighting of the section scores.
+    """
+    profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+    if not is_configured(llm_choice, api_keys):
+        # No usable LLM (local mode or no API key): deterministic local scoring instead of all zeros
+        return score_resume_local(resume_text, profile)
+    prompt = build_scoring_prompt(resume_text, profile, compact, section_budgets, structured)
+    response = query_llm(llm_choice, prompt, api_keys, use_cache=use_cache, json_mode=structured) or ""
+    result = _new_llm_result(resume_text, profile, prompt, structured)
+    with telemetry.span("scorer.parse_response"):
+        fields = parse_response(response)
+    return _finish_result(result, fields, response, resume_text, profile, llm_choice, api_keys, use_cache)
+
+def score_resume_stream(resume_text: str, job: Union[str, JobProfile], llm_choice: str, api_keys: Dict[str, str],
+                        use_cache: bool = True, compact: bool = True,
+                        section_budgets: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming score_resume(): yields a partial result each time a field of the LLM response is complete,
+    so scores can be shown before the explanations finish generating. The response is streamed in the
+    line format; the last item is the validated final result, as score_resume(structured=False) returns it.
+    """
+    profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+    if not is_configured(llm_choice, api_keys):
+        yield score_resume_local(resume_text, profile)
+        return
+    prompt = build_scoring_prompt(resume_text, profile, compact, section_budgets)
+    result = _new_llm_result(resume_text, profile, prompt, structured=False)
+    chunks: List[str] = []
+    fields: Dict[str, Any] = {}
+
+    def collect(stream: Iterable[str]) -> Iterator[str]:
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+
+    for field, value in iter_response_fields(collect(query_llm(llm_choice, prompt, api_keys, use_cache=use_cache, stream=True))):
+        fields[field] = result[field] = value
+        yield dict(result)
+    response = "".join(chunks)
+    yield _finish_result(result, fields or parse_json_response(response), response, resume_text, profile, llm_choice,
+                        api_keys, use_cache)
+
+# --- Local, network-free scoring -------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to we will with you your "
+    "who what which able ability experience work working role team years year strong good excellent "
+    "requirements required require preferred plus including etc must should knowledge".split()
+)
+BM25_K1 = 1.5
+BM25_B = 0.75
+# BM25 relevance (0-1, see bm25_relevance) at which a section earns the full 100 points
+RELEVANCE_FOR_FULL_SCORE = 0.35
+# Below this many documents IDF is too noisy to be useful, so all query terms weigh the same
+MIN_DOCUMENTS_FOR_IDF = 5
+
+# (pattern, score) from highest to lowest degree. Two-letter abbreviations are ordinary words ("me.", "Ms.",
+# "be."), so they count only fully dotted (M.S., B.A.) or upper-case and followed by "in"/"of"/"degree".
+_DEGREE_LEVELS = [
+    (re.compile(r"\b(ph\.?d|doctorate|doctoral)\b", re.IGNORECASE), 100),
+    (re.compile(r"\b(?i:master'?s?\b|m\.?sc\b|m\.?tech\b|mba\b|m\.s\.?(?!\w)|m\.e\.|m\.a\.)"
+                r"|\b(MS|MA|ME)(?=\s+(?i:in|of|degree)\b)"), 85),
+    (re.compile(r"\b(?i:bachelor'?s?\b|b\.?sc\b|b\.?tech\b|b\.s\.?(?!\w)|b\.e\.|b\.a\.|undergraduate\b|graduate degree\b)"
+                r"|\b(BS|BA|BE)(?=\s+(?i:in|of|degree)\b)"), 70),
+    (re.compile(r"\b(associate'?s? degree|diploma)\b", re.IGNORECASE), 50),
+    (re.compile(r"\b(high school|secondary school|a-levels?)\b", re.IGNORECASE), 30),
+]
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+class CorpusStats:
+    """
+    BM25 collection statistics for one query (document count, total length and document frequency of
+    the query terms), accumulated one document at a time. Passed to bm25_relevance, they make a
+    document's score independent of which other documents are scored in the same call.
+    """
+    def __init__(self, query: str):
+        self.terms = frozenset(tokenize(query))
+        self.n_docs = 0
+        self.total_length = 0
+        self.doc_freq: Counter = Counter()
+
+    def add(self, document: str) -> None:
+        tokens = tokenize(document)
+        self.n_docs += 1
+        self.total_length += len(tokens)
+        self.doc_freq.update(self.terms.intersection(tokens))
+
+def bm25_relevance(query: str, documents: Sequence[str], k1: float = BM25_K1, b: float = BM25_B,
+                   stats: Optional[CorpusStats] = None) -> "np.ndarray":
+    """
+    BM25 score of every document for the query, normalized to 0-1 by the score of a document in which
+    every query term saturates. IDF and mean length come from stats (which must include the documents) or
+    else from `documents`; IDF is uniform for fewer than MIN_DOCUMENTS_FOR_IDF documents.
+    """
+    import numpy as np  # only local scoring needs it; keeps the LLM path's import time down
+    terms = sorted(set(tokenize(query)))
+    if not terms or not documents:
+        return np.zeros(len(documents))
+    column = {t: i for i, t in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)))
+    lengths = np.zeros(len(documents))
+    for row, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[row] = len(tokens)
+        for token, count in Counter(tokens).items():
+            if token in column:
+                tf[row, column[token]] = count
+    if stats is None:
+        n_docs, df, mean_length = len(documents), (tf > 0).sum(axis=0), lengths.mean()
+    else:
+        n_docs = stats.n_docs
+        df = np.array([stats.doc_freq[t] for t in terms], dtype=float)
+        mean_length = stats.total_length / max(stats.n_docs, 1)
+    if n_docs >= MIN_DOCUMENTS_FOR_IDF:
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    else:
+        idf = np.ones(len(terms))
+    norm = k1 * (1 - b + b * lengths / max(mean_length, 1.0))
+    scores = (idf * tf * (k1 + 1) / (tf + norm[:, np.newaxis])).sum(axis=1)
+    return scores / (idf * (k1 + 1)).sum()
+
+def degree_level(text: str) -> int:
+    for pattern, level in _DEGREE_LEVELS:
+        if pattern.search(text):
+            return level
+    return 0
+
+def _relevance_score(relevance: float) -> int:
+    return int(round(min(1.0, relevance / RELEVANCE_FOR_FULL_SCORE) * 100))
+
+def _section_documents(text: str, sections: Dict[str, str]) -> Dict[str, str]:
+    # What local scoring ranks by BM25: each scored section, or the whole resume when it has none
+    return {name: sections[name] or text for name in SCORE_WEIGHTS}
+
+class LocalCorpus:
+    """
+    CorpusStats of the sections score_resumes_local ranks by BM25, over a whole upload set: add() every
+    resume in a first pass, then score the set in any number of score_resumes_local(..., corpus=) calls.
+    """
+    def __init__(self, job: Union[str, JobProfile]):
+        profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+        self.sections = {name: CorpusStats(profile.job_description) for name in SCORE_WEIGHTS}
+
+    def add(self, resume_text: str) -> None:
+        for name, document in _section_documents(resume_text, split_sections(resume_text)).items():
+            self.sections[name].add(document)
+
+@telemetry.traced("scorer.score_local")
+def score_resumes_local(resume_texts: Sequence[str], job: Union[str, JobProfile],
+                        corpus: Optional[LocalCorpus] = None) -> List[Dict[str, Any]]:
+    """
+    Deterministic, network-free scores for many resumes against one JD, in the score_resume() result shape.
+    skills: share of the JD's whitelisted skills found in the resume (70%) plus BM25 relevance of the skills section (30%);
+    experience: BM25 relevance of the experience section (whole resume when there is none) to the JD;
+    education: highest degree found, reduced when below the level the JD asks for, plus relevance of the section.
+    BM25 statistics come from corpus when given (so resumes scored in separate calls are comparable),
+    otherwise from resume_texts.
+    """
+    profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+    sections = [split_sections(text) for text in resume_texts]
+    documents = [_section_documents(text, s) for text, s in zip(resume_texts, sections)]
+    relevance = {
+        name: bm25_relevance(profile.job_description, [d[name] for d in documents],
+                             stats=corpus.sections[name] if corpus is not None else None)
+        for name in SCORE_WEIGHTS
+    }
+    experience_relevance, skills_relevance, education_relevance = (
+        relevance['experience'], relevance['skills'], relevance['education'])
+    education_docs = [d['education'] for d in documents]
+    required_level = degree_level(profile.job_description)
+
+    results = []
+    for i, text in enumerate(resume_texts):
+        result = empty_result()
+        resume_skills = extract_skills_from_text(text) | extract_all_resume_skills(text)
+        matched = sorted(profile.skill_set & resume_skills)
+        missing = sorted(profile.skill_set - resume_skills)
+        coverage = len(matched) / len(profile.skills) if profile.skills else 1.0
+        skills_score = int(round(70 * coverage + 0.3 * _relevance_score(skills_relevance[i])))
+        result['skills_score'] = skills_score
+        if profile.skills:
+            result['skills_reasoning'] = f"Covers {len(matched)} of {len(profile.skills)} skills named in the job description."
+        else:
+            result['skills_reasoning'] = "The job description names no whitelisted skills; scored on lexical relevance."
+        result['skills_suggestions'] = f"Show evidence of: {', '.join(missing)}." if missing else "Skills cover the job description."
+
+        experience_score = _relevance_score(experience_relevance[i])
+        result['experience_score'] = experience_score
+        result['experience_reasoning'] = (
+            f"Lexical relevance of the {'experience section' if sections[i]['experience'] else 'resume'} "
+            f"to the job description: {experience_relevance[i]:.2f}."
+        )
+        result['experience_suggestions'] = (
+            "Describe past roles using the terminology of the job description." if experience_score < 60
+            else "Experience aligns with the job description."
+        )
+
+        level = degree_level(education_docs[i])
+        education_score = level if level else (30 if sections[i]['education'] else 0)
+        if required_level and education_score < required_level:
+            education_score = int(education_score * 0.8)
+        education_score = int(round(0.8 * education_score + 0.2 * _relevance_score(education_relevance[i])))
+        result['education_score'] = education_score
+        result['education_reasoning'] = (
+            f"Highest degree level detected: {level}/100" + (f"; the job asks for {required_level}/100." if required_level else ".")
+        )
+        result['education_suggestions'] = (
+            "List degrees and certifications in a clearly headed Education section." if not sections[i]['education']
+            else "Education section found."
+        )
+
+        result['final_score'] = weighted_final_score(result)
+        result['overall_explanation'] = "Local lexical pre-screen (no LLM): skill coverage and BM25 relevance to the job description."
+        results.append(result)
+    return results
+
+def score_resume_local(resume_text: str, job: Union[str, JobProfile]) -> Dict[str, Any]:
+    """Local, network-free score for one resume (see score_resumes_local)."""
+    return score_resumes_local([resume_text], job)[0]
+
+def prescreen(local_results: Sequence[Dict[str, Any]], top_n: Optional[int] = None,
+              threshold: Optional[int] = None) -> List[int]:
+    """
+    Indices of the resumes worth escalating to the LLM given their score_resumes_local() results,
+    best first: the top_n by local final score and/or those scoring at least threshold.
+    """
+    order = sorted(range(len(local_results)), key=lambda i: -local_results[i]['final_score'])
+    if threshold is not None:
+        order = [i for i in order if local_results[i]['final_score'] >= threshold]
+    if top_n is not None:
+        order = order[:top_n]
+    return order
@@ -0,0 +1,126 @@
+# Vectorized skill matching: many resumes x many job descriptions in a single matrix product
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .job_profile import JobProfile, get_job_profile
+from .utils import SKILLS_WHITELIST, extract_all_resume_skills, extract_skills_from_text
+
+class SkillVocabulary:
+    """
+    Interns skill strings to dense integer ids.
+    Whitelisted skills come first, in sorted order (the same positions as job_profile.SKILL_INDEX);
+    free-form resume skills are appended as they are first seen.
+    """
+    def __init__(self, skills: Iterable[str] = SKILLS_WHITELIST):
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+        for skill in sorted(skills):
+            self.intern(skill)
+
+    def intern(self, skill: str) -> int:
+        skill_id = self._ids.get(skill)
+        if skill_id is None:
+            skill_id = self._ids[skill] = len(self._skills)
+            self._skills.append(skill)
+        return skill_id
+
+    def intern_all(self, skills: Iterable[str]) -> np.ndarray:
+        return np.unique(np.fromiter((self.intern(s) for s in skills), dtype=np.int32))
+
+    def skill(self, skill_id: int) -> str:
+        return self._skills[skill_id]
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+class SkillMatrix:
+    """
+    Resumes and job descriptions as boolean skill vectors.
+    A resume's skills are its whitelisted skills plus its free-form skills (as in utils.match_skills);
+    a JD's skills are its whitelisted skills. Only columns used by at least one JD take part in the
+    matrix product, which keeps the matrices small even with a large free-form vocabulary.
+    """
+    def __init__(self, vocabulary: Optional[SkillVocabulary] = None):
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self.resume_ids: List[Hashable] = []
+        self.job_ids: List[Hashable] = []
+        self._resume_skills: List[np.ndarray] = []
+        self._job_skills: List[np.ndarray] = []
+        self._coverage: Optional[np.ndarray] = None
+
+    def add_resume(self, resume_id: Hashable, resume_text: str) -> None:
+        skills = extract_skills_from_text(resume_text) | extract_all_resume_skills(resume_text)
+        self.add_resume_skills(resume_id, skills)
+
+    def add_resume_skills(self, resume_id: Hashable, skills: Iterable[str]) -> None:
+        self.resume_ids.append(resume_id)
+        self._resume_skills.append(self.vocabulary.intern_all(skills))
+        self._coverage = None
+
+    def add_job(self, job_id: Hashable, job: Union[str, JobProfile]) -> None:
+        profile = job if isinstance(job, JobProfile) else get_job_profile(job)
+        self.job_ids.append(job_id)
+        self._job_skills.append(self.vocabulary.intern_all(profile.skills))
+        self._coverage = None
+
+    def matrices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(resume matrix, job matrix, vocabulary ids of the columns), restricted to JD skill columns."""
+        columns = np.unique(np.concatenate(self._job_skills)) if self._job_skills else np.empty(0, dtype=np.int32)
+        lookup = np.full(len(self.vocabulary), -1, dtype=np.int64)
+        lookup[columns] = np.arange(len(columns))
+        return self._to_matrix(self._resume_skills, lookup, len(columns)), \
+            self._to_matrix(self._job_skills, lookup, len(columns)), columns
+
+    def coverage(self) -> np.ndarray:
+        """Matched-skill counts, shape (n_resumes, n_jobs)."""
+        if self._coverage is None:
+            resumes, jobs, _ = self.matrices()
+            # float32 matmul goes through BLAS and is exact for counts well below 2**24
+            self._coverage = (resumes.astype(np.float32) @ jobs.astype(np.float32).T).astype(np.int32)
+        return self._coverage
+
+    def job_skill_counts(self) -> np.ndarray:
+        return np.array([len(s) for s in self._job_skills], dtype=np.int32)
+
+    def missing_counts(self) -> np.ndarray:
+        """Missing-skill counts, shape (n_resumes, n_jobs)."""
+        return self.job_skill_counts()[np.newaxis, :] - self.coverage()
+
+    def coverage_ratio(self) -> np.ndarray:
+        """Fraction of each JD's skills covered by each resume (1.0 for JDs without whitelisted skills)."""
+        counts = self.job_skill_counts()
+        return np.divide(self.coverage(), counts, out=np.ones(self.coverage().shape), where=counts > 0)
+
+    def top_k(self, k: int = 10) -> Dict[Hashable, List[Dict[str, Any]]]:
+        """Best k resumes per JD by matched-skill count (ties keep insertion order)."""
+        coverage = self.coverage()
+        missing = self.missing_counts()
+        top: Dict[Hashable, List[Dict[str, Any]]] = {}
+        for j, job_id in enumerate(self.job_ids):
+            order = np.argsort(-coverage[:, j], kind='stable')[:k]
+            top[job_id] = [
+                {'resume_id': self.resume_ids[i], 'matched': int(coverage[i, j]), 'missing': int(missing[i, j])}
+                for i in order
+            ]
+        return top
+
+    def matched_missing(self, resume_index: int, job_index: int) -> Tuple[List[str], List[str]]:
+        """Sorted matched and missing skill names for one pair, same as match_skills()."""
+        job_skills = self._job_skills[job_index]
+        present = np.isin(job_skills, self._resume_skills[resume_index])
+        matched = sorted(self.vocabulary.skill(i) for i in job_skills[present])
+        missing = sorted(self.vocabulary.skill(i) for i in job_skills[~present])
+        return matched, missing
+
+    @staticmethod
+    def _to_matrix(rows: Sequence[np.ndarray], lookup: np.ndarray, n_columns: int) -> np.ndarray:
+        matrix = np.zeros((len(rows), n_columns), dtype=bool)
+        if not rows or not n_columns:
+            return matrix
+        lengths = np.fromiter((len(r) for r in rows), dtype=np.int64, count=len(rows))
+        row_index = np.repeat(np.arange(len(rows)), lengths)
+        column_index = lookup[np.concatenate(rows)] if lengths.sum() else np.empty(0, dtype=np.int64)
+        keep = column_index >= 0
+        matrix[row_index[keep], column_index[keep]] = True
+        return matrix
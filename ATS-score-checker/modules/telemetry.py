@@ -0,0 +1,380 @@
+# Lightweight pipeline telemetry: timed spans and counters, exported as JSON logs and Prometheus text.
+# Disabled by default; when disabled span() returns a shared no-op and count() returns immediately.
+# Process-wide exports (logs, Prometheus) are switched on by configure(); the per-stage breakdown of one
+# evaluation is recorded into a RunStats that belongs to the context (thread / app session) that started it.
+import atexit
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "ats_"
+
+logger = logging.getLogger("ats.telemetry")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    """Times a block with the monotonic clock and records it under `name` when the block exits."""
+    __slots__ = ("name", "attributes", "start", "duration")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        _record_span(self)
+        return False
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes (e.g. provider, cache hit) to the span's log record."""
+        self.attributes.update(attributes)
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class RunStats:
+    """Per-stage breakdown and counters of one evaluation (see start_run)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}  # stage -> [calls, total seconds, max seconds, errors]
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.started = time.monotonic()
+        self.ended: Optional[float] = None
+
+    def add_span(self, name: str, duration: float, failed: bool) -> None:
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = [0, 0.0, 0.0, 0]
+            stage[0] += 1
+            stage[1] += duration
+            stage[2] = max(stage[2], duration)
+            stage[3] += failed
+
+    def add_count(self, name: str, value: float, labels: Dict[str, Any]) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def end(self) -> None:
+        with self._lock:
+            if self.ended is None:
+                self.ended = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage calls/total/mean/max milliseconds, counters and wall time (so far, if still running)."""
+        with self._lock:
+            stages = [
+                {'stage': name, 'calls': int(s[0]), 'total_ms': s[1] * 1000, 'mean_ms': s[1] * 1000 / s[0],
+                 'max_ms': s[2] * 1000, 'errors': int(s[3])}
+                for name, s in self._stages.items()
+            ]
+            counters = {_format_key(name, labels): value for (name, labels), value in self._counters.items()}
+            wall = (self.ended or time.monotonic()) - self.started
+        stages.sort(key=lambda s: -s['total_ms'])
+        return {'wall_ms': wall * 1000, 'stages': stages, 'counters': dict(sorted(counters.items()))}
+
+class Registry:
+    """Process-wide metric store for the exports: a duration histogram per stage and labelled counters."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, List[float]] = {}  # stage -> bucket counts..., +Inf count, sum
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def record_span(self, span: Span) -> None:
+        duration = span.duration
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = [0.0] * (len(DURATION_BUCKETS) + 2)
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += duration
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(
+                {"event": "span", "name": span.name, "duration_ms": round(duration * 1000, 3), **span.attributes},
+                default=str,
+            ))
+
+    def count(self, name: str, value: float, labels: Dict[str, Any]) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"event": "counter", "name": name, "value": value, **labels}, default=str))
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, float]]) -> None:
+        with self._lock:
+            self._collectors[name] = collect
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            histograms = {name: list(h) for name, h in self._histograms.items()}
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+        lines: List[str] = []
+        metric = f"{METRIC_PREFIX}stage_duration_seconds"
+        if histograms:
+            lines += [f"# HELP {metric} Time spent in each pipeline stage.", f"# TYPE {metric} histogram"]
+        for stage, h in sorted(histograms.items()):
+            for bound, bucket_count in zip(DURATION_BUCKETS, h):
+                lines.append(f'{metric}_bucket{{stage="{_escape(stage)}",le="{bound}"}} {bucket_count:g}')
+            lines.append(f'{metric}_bucket{{stage="{_escape(stage)}",le="+Inf"}} {h[-2]:g}')
+            lines.append(f'{metric}_sum{{stage="{_escape(stage)}"}} {h[-1]:.6f}')
+            lines.append(f'{metric}_count{{stage="{_escape(stage)}"}} {h[-2]:g}')
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        for prefix, collect in sorted(collectors.items()):
+            try:
+                values = collect()
+            except Exception:
+                continue
+            for name, value in sorted(values.items()):
+                metric = f"{METRIC_PREFIX}{prefix}_{name}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+def _format_key(name: str, labels: LabelKey) -> str:
+    return name + _format_labels(labels)
+
+_registry = Registry()
+_enabled = False  # process-wide exports
+# The run being recorded in this context; worker threads pick it up through bind_run()
+_current_run: "contextvars.ContextVar[Optional[RunStats]]" = contextvars.ContextVar("ats_telemetry_run", default=None)
+_metrics_path: Optional[str] = None
+_log_handler: Optional[logging.Handler] = None
+_log_path: Optional[str] = None
+_server: Optional[ThreadingHTTPServer] = None
+_config_lock = threading.Lock()
+
+# --- recording ---------------------------------------------------------------------------------
+
+def _active_run() -> Optional[RunStats]:
+    run_stats = _current_run.get()
+    return run_stats if run_stats is not None and run_stats.ended is None else None
+
+def _record_span(span: Span) -> None:
+    failed = "error" in span.attributes
+    run_stats = _active_run()
+    if run_stats is not None:
+        run_stats.add_span(span.name, span.duration, failed)
+    if _enabled:
+        _registry.record_span(span)
+    if failed:
+        count("errors", stage=span.name)
+
+def span(name: str, **attributes: Any) -> Any:
+    """Context manager timing a pipeline stage: `with telemetry.span("parser.extract", file=name): ...`."""
+    if not _enabled and _active_run() is None:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording every call of the function as a span called name."""
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled and _active_run() is None:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """Add value to the counter name{labels} (exported as ats_<name>_total)."""
+    run_stats = _active_run()
+    if run_stats is not None:
+        run_stats.add_count(name, value, labels)
+    if _enabled:
+        _registry.count(name, value, labels)
+
+def is_enabled() -> bool:
+    """True when the process-wide exports are recording (see configure)."""
+    return _enabled
+
+def bind_run(fn: Callable) -> Callable:
+    """Wrap fn so that calls on worker threads record into the run active in the caller's context."""
+    run_stats = _active_run()
+    if run_stats is None:
+        return fn
+
+    @wraps(fn)
+    def call(*args: Any, **kwargs: Any) -> Any:
+        token = _current_run.set(run_stats)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_run.reset(token)
+    return call
+
+# --- runs and export ---------------------------------------------------------------------------
+
+def start_run(record: Optional[bool] = None) -> Optional[RunStats]:
+    """
+    Start recording one evaluation's per-stage breakdown in the current context (thread / app session).
+    record defaults to is_enabled(); returns the RunStats, or None when not recording.
+    """
+    run_stats = RunStats() if (_enabled if record is None else record) else None
+    _current_run.set(run_stats)
+    return run_stats
+
+def end_run(run_stats: Optional[RunStats] = None) -> None:
+    """Finish the evaluation (default: the current context's): fixes its wall time and writes the metrics file."""
+    run_stats = run_stats or _current_run.get()
+    if run_stats is not None:
+        run_stats.end()
+    if _enabled:
+        write_metrics()
+
+class run:
+    """Context manager around one evaluation: start_run(record) on entry (binding the RunStats), end_run() on exit."""
+    def __init__(self, record: Optional[bool] = None):
+        self.record = record
+        self.stats: Optional[RunStats] = None
+
+    def __enter__(self) -> Optional[RunStats]:
+        self.stats = start_run(self.record)
+        return self.stats
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        end_run(self.stats)
+        return False
+
+def last_run() -> Dict[str, Any]:
+    """Breakdown of the run started last in this context (empty when none was recorded)."""
+    run_stats = _current_run.get()
+    return run_stats.summary() if run_stats is not None else RunStats().summary()
+
+def register_collector(name: str, collect: Callable[[], Dict[str, float]]) -> None:
+    """Export collect()'s values as gauges ats_<name>_<key> (e.g. cache statistics) at every scrape."""
+    _registry.register_collector(name, collect)
+
+def render_prometheus() -> str:
+    return _registry.render_prometheus()
+
+def write_metrics(path: Optional[str] = None) -> None:
+    """Write the Prometheus text exposition to path (default: the configured metrics file), atomically."""
+    path = path or _metrics_path
+    if not path:
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread (once per process; later calls return the running server)."""
+    global _server
+    with _config_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="ats-metrics", daemon=True).start()
+        return _server
+
+def configure(enabled: Optional[bool] = None, log_path: Optional[str] = None, metrics_path: Optional[str] = None,
+              metrics_port: Optional[int] = None) -> None:
+    """
+    enabled: turn recording on/off. log_path: append one JSON object per span/counter ('-' for stderr).
+    metrics_path: Prometheus text file written after every run() and at exit. metrics_port: serve /metrics over HTTP.
+    Arguments left as None keep their current setting.
+    """
+    global _enabled, _metrics_path, _log_handler, _log_path
+    if enabled is not None:
+        _enabled = enabled
+    with _config_lock:
+        # One handler per process: configuring the same path again is a no-op, a new path replaces the old one
+        if log_path and log_path != _log_path:
+            handler = logging.StreamHandler() if log_path == "-" else logging.FileHandler(log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            if _log_handler is not None:
+                logger.removeHandler(_log_handler)
+                _log_handler.close()
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            _log_handler, _log_path = handler, log_path
+    if metrics_path:
+        _metrics_path = metrics_path
+    if metrics_port:
+        serve_metrics(metrics_port)
+
+def configure_from_env() -> None:
+    """ATS_TELEMETRY=1 enables recording; ATS_TELEMETRY_LOG, ATS_METRICS_FILE and ATS_METRICS_PORT enable it and set up the exports."""
+    log_path = os.getenv("ATS_TELEMETRY_LOG")
+    metrics_path = os.getenv("ATS_METRICS_FILE")
+    metrics_port = int(os.getenv("ATS_METRICS_PORT", "0")) or None
+    enabled = os.getenv("ATS_TELEMETRY", "0") == "1" or bool(log_path or metrics_path or metrics_port)
+    configure(enabled=enabled, log_path=log_path, metrics_path=metrics_path, metrics_port=metrics_port)
+
+configure_from_env()
+atexit.register(lambda: write_metrics() if _enabled else None)
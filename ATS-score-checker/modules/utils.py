@@ -1,67 +1,160 @@
-# Helper functions for ATS system
-import os
-from typing import List, Tuple, Set
-import re
-
-# Curated list of common technical, business, and soft skills
-SKILLS_WHITELIST = set([
-    # Technical
-    "python", "r", "java", "c++", "c#", "sql", "nosql", "mongodb", "mysql", "postgresql", "oracle", "excel", "powerpoint", "word", "tableau", "power bi", "sas", "stata", "matlab", "vba", "html", "css", "javascript", "typescript", "react", "angular", "node.js", "flask", "django", "spring", "aws", "azure", "gcp", "docker", "kubernetes", "git", "linux", "bash", "unix", "jira", "confluence", "rest api", "graphql", "machine learning", "deep learning", "nlp", "data science", "data analysis", "data visualization", "statistics", "regression", "classification", "clustering", "forecasting", "etl", "big data", "hadoop", "spark", "airflow", "ci/cd", "devops",
-    # Business
-    "project management", "agile", "scrum", "kanban", "stakeholder management", "budgeting", "forecasting", "business analysis", "requirement gathering", "risk management", "product management", "crm", "erp", "salesforce", "marketing", "seo", "sem", "content marketing", "digital marketing", "market research", "customer service", "supply chain", "logistics", "procurement", "negotiation", "accounting", "finance", "financial modeling", "investment analysis", "presentation", "public speaking", "report writing", "documentation", "training", "mentoring",
-    # Soft skills
-    "communication", "teamwork", "leadership", "problem solving", "critical thinking", "creative thinking", "adaptability", "time management", "organization", "collaboration", "conflict resolution", "decision making", "attention to detail", "initiative", "self-motivation", "empathy", "emotional intelligence", "persuasion", "networking", "active listening", "customer focus", "multitasking", "work ethic", "stress management", "flexibility", "analytical skills", "resourcefulness", "presentation skills"
-])
-
-import re
-from typing import Set, Tuple, List
-
-def extract_skills_from_text(text: str) -> Set[str]:
-    text = text.lower()
-    found_skills = set()
-    for skill in SKILLS_WHITELIST:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text):
-            found_skills.add(skill)
-    return found_skills
-
-def extract_all_resume_skills(text: str) -> Set[str]:
-    """
-    Extract plausible skills listed in resume by looking for lines with commas, bullets, or sections titled 'Skills'.
-    """
-    text = text.lower()
-    skills = set()
-    # Extract lines under 'skills' section
-    skill_section = re.findall(r'skills[\s:]*([\s\S]{0,400})', text)
-    for block in skill_section:
-        # Split by comma, semicolon, newlines
-        for part in re.split(r'[\n,;•\-]', block):
-            s = part.strip().replace('.', '')
-            if 2 < len(s) < 40 and any(c.isalpha() for c in s):
-                skills.add(s)
-    # Also pick up any comma-separated lines
-    for line in text.splitlines():
-        if ',' in line or '•' in line:
-            for part in re.split(r'[\n,;•\-]', line):
-                s = part.strip().replace('.', '')
-                if 2 < len(s) < 40 and any(c.isalpha() for c in s):
-                    skills.add(s)
-    # Remove obvious non-skills
-    blacklist = {'skills', 'summary', 'experience', 'education', 'work', 'professional', 'profile', 'responsibilities', 'projects', 'objective', 'certifications', 'languages', 'interests'}
-    skills = {s for s in skills if s not in blacklist}
-    return skills
-
-def match_skills(job_description: str, resume_text: str) -> Tuple[List[str], List[str], List[str], List[str]]:
-    jd_skills = sorted(list(extract_skills_from_text(job_description)))
-    resume_whitelist_skills = sorted(list(extract_skills_from_text(resume_text)))
-    resume_all_skills = sorted(list(extract_all_resume_skills(resume_text)))
-    matched = sorted(list(set(jd_skills) & set(resume_whitelist_skills + resume_all_skills)))
-    missing = sorted(list(set(jd_skills) - set(matched)))
-    return jd_skills, resume_all_skills, matched, missing
-
-def get_file_extension(filename: str) -> str:
-    return os.path.splitext(filename)[1].lower()
-
-def filter_top_resumes(results: List[dict], threshold: int = 70) -> List[dict]:
-    """Return resumes with score >= threshold."""
-    return [r for r in results if r.get('score', 0) >= threshold]
-
+# Helper functions for ATS system
+import os
+from typing import List, Tuple, Set
+import re
+
+# Curated list of common technical, business, and soft skills
+SKILLS_WHITELIST = set([
+    # Technical
+    "python", "r", "java", "c++", "c#", "sql", "nosql", "mongodb", "mysql", "postgresql", "oracle", "excel", "powerpoint", "word", "tableau", "power bi", "sas", "stata", "matlab", "vba", "html", "css", "javascript", "typescript", "react", "angular", "node.js", "flask", "django", "spring", "aws", "azure", "gcp", "docker", "kubernetes", "git", "linux", "bash", "unix", "jira", "confluence", "rest api", "graphql", "machine learning", "deep learning", "nlp", "data science", "data analysis", "data visualization", "statistics", "regression", "classification", "clustering", "forecasting", "etl", "big data", "hadoop", "spark", "airflow", "ci/cd", "devops",
+    # Business
+    "project management", "agile", "scrum", "kanban", "stakeholder management", "budgeting", "forecasting", "business analysis", "requirement gathering", "risk management", "product management", "crm", "erp", "salesforce", "marketing", "seo", "sem", "content marketing", "digital marketing", "market research", "customer service", "supply chain", "logistics", "procurement", "negotiation", "accounting", "finance", "financial modeling", "investment analysis", "presentation", "public speaking", "report writing", "documentation", "training", "mentoring",
+    # Soft skills
+    "communication", "teamwork", "leadership", "problem solving", "critical thinking", "creative thinking", "adaptability", "time management", "organization", "collaboration", "conflict resolution", "decision making", "attention to detail", "initiative", "self-motivation", "empathy", "emotional intelligence", "persuasion", "networking", "active listening", "customer focus", "multitasking", "work ethic", "stress management", "flexibility", "analytical skills", "resourcefulness", "presentation skills"
+])
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional, Set, Tuple, List, Union
+
+from . import telemetry
+
+if TYPE_CHECKING:
+    from .job_profile import JobProfile
+
+class SkillMatcher:
+    """
+    Finds every skill of a vocabulary in a single pass over the text.
+    Equivalent to running re.search(r'\b' + re.escape(skill) + r'\b', text) per skill,
+    but the alternation is compiled once and the text is scanned only once.
+    """
+    def __init__(self, skills: Iterable[str]):
+        self.skills: FrozenSet[str] = frozenset(s.lower() for s in skills if s)
+        # Longest first, so the alternation prefers "presentation skills" over "presentation"
+        ordered = sorted(self.skills, key=lambda s: (-len(s), s))
+        # Zero-width lookahead so matches starting at every position are reported, even overlapping ones
+        alternation = "|".join(re.escape(s) for s in ordered)
+        self._pattern = re.compile(r'\b(?=(' + alternation + r')\b)') if ordered else None
+        # When a longer skill matches at a position, any shorter skill that is a prefix of it
+        # and ends on a word boundary inside it matches at the same position as well
+        self._implied: Dict[str, Tuple[str, ...]] = {}
+        for skill in ordered:
+            self._implied[skill] = tuple(
+                s for s in ordered
+                if len(s) < len(skill) and skill.startswith(s) and _is_boundary(skill, len(s))
+            )
+
+    def find(self, text: str) -> Set[str]:
+        found = set()
+        if self._pattern is None:
+            return found
+        for m in self._pattern.finditer(text.lower()):
+            skill = m.group(1)
+            found.add(skill)
+            found.update(self._implied[skill])
+        return found
+
+    def extend(self, skills: Iterable[str]) -> "SkillMatcher":
+        return get_skill_matcher(self.skills | frozenset(s.lower() for s in skills if s))
+
+def _is_boundary(word: str, i: int) -> bool:
+    # Same rule as regex \b for a position strictly inside a string
+    return _is_word_char(word[i - 1]) != _is_word_char(word[i])
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+@lru_cache(maxsize=32)
+def get_skill_matcher(skills: FrozenSet[str] = frozenset(SKILLS_WHITELIST)) -> SkillMatcher:
+    """Return a compiled matcher for the given vocabulary, built once per distinct vocabulary."""
+    return SkillMatcher(skills)
+
+def extract_skills_from_text(text: str, skills: Optional[Union[SkillMatcher, Iterable[str]]] = None) -> Set[str]:
+    """
+    Return the whitelisted skills mentioned in text.
+    skills: optional custom vocabulary (iterable of skills) or a prebuilt SkillMatcher;
+    defaults to SKILLS_WHITELIST.
+    """
+    if skills is None:
+        matcher = get_skill_matcher()
+    elif isinstance(skills, SkillMatcher):
+        matcher = skills
+    else:
+        matcher = get_skill_matcher(frozenset(s.lower() for s in skills))
+    return matcher.find(text)
+
+def extract_all_resume_skills(text: str) -> Set[str]:
+    """
+    Extract plausible skills listed in resume by looking for lines with commas, bullets, or sections titled 'Skills'.
+    """
+    text = text.lower()
+    skills = set()
+    # Extract lines under 'skills' section
+    skill_section = re.findall(r'skills[\s:]*([\s\S]{0,400})', text)
+    for block in skill_section:
+        # Split by comma, semicolon, newlines
+        for part in re.split(r'[\n,;•\-]', block):
+            s = part.strip().replace('.', '')
+            if 2 < len(s) < 40 and any(c.isalpha() for c in s):
+                skills.add(s)
+    # Also pick up any comma-separated lines
+    for line in text.splitlines():
+        if ',' in line or '•' in line:
+            for part in re.split(r'[\n,;•\-]', line):
+                s = part.strip().replace('.', '')
+                if 2 < len(s) < 40 and any(c.isalpha() for c in s):
+                    skills.add(s)
+    # Remove obvious non-skills
+    blacklist = {'skills', 'summary', 'experience', 'education', 'work', 'professional', 'profile', 'responsibilities', 'projects', 'objective', 'certifications', 'languages', 'interests'}
+    skills = {s for s in skills if s not in blacklist}
+    return skills
+
+@telemetry.traced("utils.match_skills")
+def match_skills(job_description: Union[str, "JobProfile"], resume_text: str) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """
+    Returns (jd_skills, resume_skills, matched, missing).
+    job_description: JD text or a precompiled JobProfile, whose JD skills are reused instead of re-extracted.
+    """
+    if isinstance(job_description, str):
+        jd_skills = sorted(list(extract_skills_from_text(job_description)))
+    else:
+        jd_skills = list(job_description.skills)
+    resume_whitelist_skills = sorted(list(extract_skills_from_text(resume_text)))
+    resume_all_skills = sorted(list(extract_all_resume_skills(resume_text)))
+    matched = sorted(list(set(jd_skills) & set(resume_whitelist_skills + resume_all_skills)))
+    missing = sorted(list(set(jd_skills) - set(matched)))
+    return jd_skills, resume_all_skills, matched, missing
+
+# Resume section headers, matched against whole (short) lines
+SECTION_HEADERS = {
+    'education': ('education', 'academic background', 'academics', 'education and training', 'qualifications', 'certifications'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'core competencies', 'competencies', 'technologies', 'tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment', 'employment history', 'work history', 'projects', 'internships'),
+}
+_SECTION_LOOKUP = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+_HEADER_LINE_RE = re.compile(r'^[\s#*•\-]*([A-Za-z &/]{3,40}?)[\s:]*$')
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Split resume text into 'education', 'skills', 'experience' and 'other' (everything before the
+    first recognised header or under unrecognised ones such as 'Summary').
+    """
+    sections: Dict[str, List[str]] = {'education': [], 'skills': [], 'experience': [], 'other': []}
+    current = 'other'
+    for line in text.splitlines():
+        m = _HEADER_LINE_RE.match(line)
+        if m:
+            header = m.group(1).strip().lower()
+            if header in _SECTION_LOOKUP:
+                current = _SECTION_LOOKUP[header]
+                continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+def get_file_extension(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
+
+def filter_top_resumes(results: List[dict], threshold: int = 70, key: str = 'score') -> List[dict]:
+    """Return resumes with results[key] >= threshold."""
+    return [r for r in results if r.get(key, 0) >= threshold]
+
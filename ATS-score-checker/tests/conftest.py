@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.fake_llm import FakeLLMConfig, start_server
+from modules import cache
+
+
+@pytest.fixture
+def fake_llm():
+    """A local OpenAI-compatible server with no latency; tests adjust server.config for error injection."""
+    server = start_server(FakeLLMConfig(latency=0.0, jitter=0.0, token_delay=0.0, seed=0))
+    server.base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    server.api_keys = {"openai": "test", "openai_base_url": server.base_url}
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    """A fresh memory-only process cache, so tests neither read nor write the on-disk one."""
+    fresh = cache.LLMCache()
+    monkeypatch.setattr(cache, "_cache", fresh)
+    return fresh
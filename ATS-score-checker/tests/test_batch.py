@@ -0,0 +1,52 @@
+import io
+import random
+
+from benchmarks.corpus import make_docx, make_job_description, make_pdf, make_resume_text
+from modules import batch, parser, scorer
+
+
+def _upload(name, data):
+    f = io.BytesIO(data)
+    f.name = name
+    return f
+
+
+def _uploads(n):
+    rng = random.Random(1)
+    files = [_upload(f"r{i}.pdf", make_pdf(make_resume_text(rng, n_roles=1))) for i in range(n)]
+    return files + [_upload("broken.pdf", b"not a pdf")]
+
+
+def test_prescreen_scores_in_chunks_and_escalates_top_n(fake_llm, llm_cache, monkeypatch):
+    monkeypatch.setattr(batch, "PRESCREEN_CHUNK", 2)
+    parser.clear_cache()
+    jd = make_job_description(random.Random(2))
+    rows = list(batch.evaluate_resumes(_uploads(5), jd, "OpenAI gpt-3.5-turbo", fake_llm.api_keys,
+                                       max_workers=2, prescreen_top_n=2))
+    by_name = {row["filename"]: row for row in rows}
+    assert len(rows) == 6
+    assert by_name["broken.pdf"]["error"]
+    assert sorted(row["scoring"] for row in rows if not row["error"]) == ["llm", "llm", "local", "local", "local"]
+    assert fake_llm.config.requests == 2
+
+
+def test_prescreen_without_llm_keeps_local_scores(monkeypatch):
+    monkeypatch.setattr(batch, "PRESCREEN_CHUNK", 2)
+    jd = make_job_description(random.Random(2))
+    rows = list(batch.evaluate_resumes(_uploads(3), jd, "Local (no LLM)", {}, prescreen_top_n=1))
+    assert [row["scoring"] for row in rows if not row["error"]] == ["local"] * 3
+    assert all(row["final_score"] > 0 for row in rows if not row["error"])
+
+
+def test_identical_resume_scores_the_same_in_every_chunk(monkeypatch):
+    monkeypatch.setattr(batch, "PRESCREEN_CHUNK", 6)
+    rng = random.Random(5)
+    texts = [make_resume_text(rng, n_roles=2) for _ in range(6)]
+    files = [_upload(f"r{i}.docx", make_docx(text)) for i, text in enumerate(texts)]
+    files.append(_upload("r6.docx", make_docx(texts[0])))  # alone in the second chunk
+    jd = make_job_description(random.Random(6))
+    rows = {row["filename"]: row for row in batch.evaluate_resumes(files, jd, "Local (no LLM)", {}, prescreen_top_n=3)}
+    assert rows["r6.docx"]["final_score"] == rows["r0.docx"]["final_score"]
+    # Chunked scores equal scoring the whole batch in one call
+    whole = scorer.score_resumes_local(texts + texts[:1], jd)
+    assert [rows[f"r{i}.docx"]["final_score"] for i in range(7)] == [r["final_score"] for r in whole]
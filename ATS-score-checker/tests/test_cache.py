@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+
+from modules import cache, llm_handler
+
+LLM = "OpenAI gpt-3.5-turbo"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic time.time() for the cache: every call advances one second."""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    llm_cache = cache.LLMCache(max_entries=2)
+    llm_cache.set("a", "1")
+    llm_cache.set("b", "2")
+    assert llm_cache.get("a") == "1"
+    llm_cache.set("c", "3")
+    assert llm_cache.get("b") is None
+    assert (llm_cache.get("a"), llm_cache.get("c")) == ("1", "3")
+    assert llm_cache.stats() == {"hits": 3, "misses": 1, "memory_hits": 3, "disk_hits": 0, "memory_entries": 2}
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    cache.LLMCache(db_path=path).set("a", "1")
+    reopened = cache.LLMCache(db_path=path)
+    assert reopened.get("a") == "1"
+    assert reopened.get("a") == "1"
+    assert reopened.stats()["disk_hits"] == 1 and reopened.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_evicts_least_recently_accessed(tmp_path, clock):
+    llm_cache = cache.LLMCache(max_entries=1, db_path=str(tmp_path / "llm.sqlite"), max_disk_entries=2)
+    llm_cache.set("a", "1")
+    llm_cache.set("b", "2")
+    assert llm_cache.get("a") == "1"  # read from disk: "a" is now more recent than "b"
+    llm_cache.set("c", "3")
+    assert llm_cache.stats()["disk_entries"] == 2
+    reopened = cache.LLMCache(db_path=str(tmp_path / "llm.sqlite"))
+    assert (reopened.get("a"), reopened.get("b"), reopened.get("c")) == ("1", None, "3")
+
+
+def test_disk_entries_expire_after_ttl(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite")
+    cache.LLMCache(db_path=path, ttl=5).set("a", "1")
+    assert cache.LLMCache(db_path=path, ttl=5).get("a") == "1"
+    assert cache.LLMCache(db_path=path, ttl=1).get("a") is None
+    assert cache.LLMCache(db_path=path, ttl=5).stats()["disk_entries"] == 0
+
+
+def test_query_llm_answers_repeats_from_the_disk_cache(tmp_path, fake_llm, monkeypatch):
+    path = str(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(cache, "_cache", cache.LLMCache(db_path=path))
+    first = llm_handler.query_llm(LLM, "Score this resume.", fake_llm.api_keys)
+    # Whitespace differences do not change the key
+    assert llm_handler.query_llm(LLM, "Score  this\nresume.", fake_llm.api_keys) == first
+    monkeypatch.setattr(cache, "_cache", cache.LLMCache(db_path=path))
+    assert llm_handler.query_llm(LLM, "Score this resume.", fake_llm.api_keys) == first
+    assert llm_handler.query_llm(LLM, "Score this resume.", fake_llm.api_keys, use_cache=False) == first
+    assert fake_llm.config.requests == 2
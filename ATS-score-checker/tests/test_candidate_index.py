@@ -0,0 +1,114 @@
+import pytest
+
+from benchmarks import fake_llm as fake_llm_module
+from benchmarks.corpus import make_pdf
+from modules import batch, cli, parser, scorer
+from modules.candidate_index import CandidateIndex
+from modules.job_profile import get_job_profile
+from modules.llm_handler import model_id
+
+JD = "Requirements\n- 3+ years of python and sql\n- Experience with aws and docker\n"
+LLM = "OpenAI gpt-3.5-turbo"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = CandidateIndex(str(tmp_path / "pool.sqlite"))
+    yield index
+    index.close()
+
+
+def _add(index, name, text):
+    index.upsert_resume(name * 8, f"{name}.pdf", text)
+    return name * 8
+
+
+def test_failed_llm_answer_is_reported_and_not_stored(index, fake_llm, llm_cache, monkeypatch):
+    content_hash = _add(index, "a", "Skills\npython, sql\nExperience\nData engineer 2019-2023")
+    profile = get_job_profile(JD)
+    monkeypatch.setattr(fake_llm_module, "render_answer", lambda *args: "Sorry, I cannot evaluate this resume.")
+    row = batch.evaluate_indexed(index, content_hash, profile, LLM, fake_llm.api_keys)
+    assert row["error"] and row["final_score"] == 0
+    assert index.get_score(content_hash, profile.jd_hash, model_id(LLM, fake_llm.api_keys)) is None
+
+    monkeypatch.undo()
+    row = batch.evaluate_indexed(index, content_hash, profile, LLM, fake_llm.api_keys, use_cache=False)
+    assert not row["error"]
+    assert index.get_score(content_hash, profile.jd_hash, model_id(LLM, fake_llm.api_keys)) is not None
+
+
+def test_unscored_only_visits_resumes_without_a_stored_score(index, fake_llm, llm_cache):
+    hashes = [_add(index, name, f"Skills\npython, sql\nExperience\nEngineer {name}") for name in "abc"]
+    profile = get_job_profile(JD)
+    model = model_id(LLM, fake_llm.api_keys)
+    index.set_score(hashes[1], profile.jd_hash, model, {"final_score": 90})
+    assert list(index.iter_unscored(profile.jd_hash, model, page_size=1)) == [hashes[0], hashes[2]]
+    rows = list(cli.score_index(index, JD, LLM, fake_llm.api_keys, unscored_only=True))
+    assert sorted(row["filename"] for row in rows) == ["a.pdf", "c.pdf"]
+    assert list(index.iter_unscored(profile.jd_hash, model)) == []
+
+
+def test_iter_hashes_pages_by_key(index):
+    hashes = [_add(index, name, "Skills\npython") for name in "abcdefg"]
+    assert list(index.iter_hashes(page_size=3)) == hashes
+    pages = index.iter_hashes(page_size=2)
+    assert [next(pages), next(pages)] == hashes[:2]
+    # Keyset paging continues after the last id seen, so changes behind the cursor do not shift later pages
+    index.remove(hashes[0])
+    index.remove(hashes[3])
+    new = _add(index, "h", "Skills\nsql")
+    assert list(pages) == [hashes[2], *hashes[4:], new]
+    assert len(index) == 6
+
+
+def test_match_job_ranks_by_covered_jd_skills(index):
+    profile = get_job_profile(JD)
+    assert profile.skills == ("aws", "docker", "python", "sql")
+    _add(index, "a", "Skills\npython")
+    _add(index, "b", "Skills\npython, sql, aws, docker")
+    _add(index, "c", "Skills\nexcel, tableau")
+    _add(index, "d", "Skills\nsql, aws")
+    _add(index, "e", "Skills\ndocker, aws")
+    matches = index.match_job(profile)
+    assert [(m['filename'], m['matched'], m['missing']) for m in matches] == [
+        ("b.pdf", 4, 0), ("d.pdf", 2, 2), ("e.pdf", 2, 2), ("a.pdf", 1, 3),
+    ]
+    assert [m['filename'] for m in index.match_job(JD, limit=2)] == ["b.pdf", "d.pdf"]
+    assert [m['filename'] for m in index.match_job(profile, min_matched=2)] == ["b.pdf", "d.pdf", "e.pdf"]
+    assert index.match_job("We are hiring a friendly colleague.") == []
+
+
+def test_indexed_file_is_not_parsed_again(index, monkeypatch):
+    data = make_pdf("Skills\npython, sql")
+    content_hash = index.add_bytes("resume.pdf", data)
+    monkeypatch.setattr(parser, "extract_bytes", lambda *args, **kwargs: pytest.fail("parsed again"))
+    assert index.add_bytes("copy.pdf", data) == content_hash
+    assert index.get_resume(content_hash).skills >= {"python", "sql"}
+
+
+def test_partially_repaired_score_is_not_stored(index, fake_llm, llm_cache, monkeypatch):
+    content_hash = _add(index, "a", "Skills\npython, sql\nExperience\nData engineer 2019-2023")
+    profile = get_job_profile(JD)
+    model = model_id(LLM, fake_llm.api_keys)
+    fake_llm.config.malformed_rate = 1.0  # experience_score is "n/a"
+    render_answer = fake_llm_module.render_answer
+    monkeypatch.setattr(fake_llm_module, "render_answer",
+                        lambda prompt, *args: "Sorry." if "ONLY these keys" in prompt else render_answer(prompt, *args))
+    row = batch.evaluate_indexed(index, content_hash, profile, LLM, fake_llm.api_keys)
+    assert row["error"] and row["education_score"] > 0 and row["experience_score"] == 0
+    assert index.get_score(content_hash, profile.jd_hash, model) is None
+    assert list(index.iter_unscored(profile.jd_hash, model)) == [content_hash]
+
+
+def test_only_complete_results_are_stored(index, monkeypatch):
+    content_hash = _add(index, "a", "Skills\npython, sql")
+    profile = get_job_profile(JD)
+    partial = dict(scorer.empty_result(), education_score=70, skills_score=80, final_score=45, error='',
+                   missing_scores=['experience_score'])
+    monkeypatch.setattr(batch, "score_resume", lambda *args, **kwargs: partial)
+    monkeypatch.setattr(batch, "model_id", lambda *args: "fake:model")
+    batch.evaluate_indexed(index, content_hash, profile, LLM, {})
+    assert index.get_score(content_hash, profile.jd_hash, "fake:model") is None
+    monkeypatch.setattr(batch, "score_resume", lambda *args, **kwargs: dict(partial, missing_scores=[]))
+    batch.evaluate_indexed(index, content_hash, profile, LLM, {})
+    assert index.get_score(content_hash, profile.jd_hash, "fake:model")["final_score"] == 45
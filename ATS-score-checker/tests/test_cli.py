@@ -0,0 +1,21 @@
+from benchmarks.corpus import make_pdf
+from modules import batch, cli
+
+JD = "Requirements\n- 3+ years of python and sql\n- Experience with aws\n"
+
+
+def test_unreadable_path_gets_a_full_error_row(tmp_path):
+    rows = list(cli.score_paths([str(tmp_path / "missing.pdf")], JD, "Local (no LLM)", {}))
+    assert len(rows) == 1
+    assert rows[0].keys() == batch._empty_row("").keys()
+    assert rows[0]["error"]
+
+
+def test_exit_status_reports_failed_resumes(tmp_path):
+    jd = tmp_path / "job.txt"
+    jd.write_text(JD, encoding="utf-8")
+    (tmp_path / "good.pdf").write_bytes(make_pdf("Skills\npython, sql, aws"))
+    args = ["--jd", str(jd), "--llm", "Local (no LLM)", "-o", str(tmp_path / "out.jsonl")]
+    assert cli.main(args + [str(tmp_path / "good.pdf")]) == 0
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    assert cli.main(args + [str(tmp_path / "good.pdf"), str(tmp_path / "broken.pdf")]) == 1
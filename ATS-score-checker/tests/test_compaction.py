@@ -0,0 +1,64 @@
+import glob
+import os
+import re
+
+import pytest
+
+from modules.compaction import compact_resume, strip_repeated_lines
+from modules.scorer import degree_level, score_resume_local
+from modules.utils import extract_skills_from_text, split_sections
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "compaction")
+RESUMES = sorted(p for p in glob.glob(os.path.join(FIXTURES, "*.txt")) if not p.endswith("jd.txt"))
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def job_description():
+    return _read(os.path.join(FIXTURES, "jd.txt"))
+
+
+@pytest.mark.parametrize("line", ["Page 2", "page 2 of 3", "PAGE 3/5", "2 of 3", "- 4 -"])
+def test_page_number_lines_are_dropped(line):
+    assert strip_repeated_lines(f"Experience\n{line}\nBuilt pipelines") == "Experience\nBuilt pipelines"
+
+
+@pytest.mark.parametrize("line", ["2019", "12", "1/2", "05/2020", "See page 3 of portfolio", "2018 - 2019"])
+def test_content_lines_are_kept(line):
+    assert strip_repeated_lines(f"Experience\n{line}\nBuilt pipelines") == f"Experience\n{line}\nBuilt pipelines"
+
+
+def test_repeated_header_keeps_first_copy():
+    text = "Jane Doe\nSkills\npython\nJane Doe\nsql\nJane Doe"
+    assert strip_repeated_lines(text) == "Jane Doe\nSkills\npython\nsql"
+
+
+@pytest.mark.parametrize("path", RESUMES, ids=os.path.basename)
+def test_compaction_shrinks_fixture(path):
+    compacted = compact_resume(_read(path))
+    assert compacted.compacted_tokens < compacted.original_tokens
+
+
+@pytest.mark.parametrize("path", RESUMES, ids=os.path.basename)
+def test_compaction_preserves_scored_content(path):
+    text = _read(path)
+    compacted = compact_resume(text).text
+    # Matching intersects with the JD's whitelisted skills, so those are what must survive
+    assert extract_skills_from_text(compacted) == extract_skills_from_text(text)
+    assert degree_level(split_sections(compacted)['education']) == degree_level(split_sections(text)['education'])
+    assert set(re.findall(r"\b(?:19|20)\d\d\b", compacted)) == set(re.findall(r"\b(?:19|20)\d\d\b", text))
+
+
+@pytest.mark.parametrize("path", RESUMES, ids=os.path.basename)
+def test_compaction_does_not_change_scores(path, job_description):
+    text = _read(path)
+    raw = score_resume_local(text, job_description)
+    compacted = score_resume_local(compact_resume(text).text, job_description)
+    assert compacted['education_score'] == raw['education_score']
+    assert compacted['skills_score'] == raw['skills_score']
+    # Repeated page headers count towards lexical relevance in the raw text, so experience may move slightly
+    assert abs(compacted['final_score'] - raw['final_score']) <= 5
@@ -0,0 +1,46 @@
+import pytest
+
+from modules.scorer import degree_level, score_resume_local
+
+
+@pytest.mark.parametrize("text, level", [
+    ("PhD in Physics", 100),
+    ("Master of Science in Data Science", 85),
+    ("M.S. in Computer Science", 85),
+    ("M.S Computer Science", 85),
+    ("MS in Computer Science", 85),
+    ("MSc Data Science", 85),
+    ("M.E. Mechanical", 85),
+    ("MBA", 85),
+    ("Bachelor's degree in Economics", 70),
+    ("B.A. English", 70),
+    ("B.E. Civil Engineering", 70),
+    ("BS degree", 70),
+    ("BSc Computer Science", 70),
+    ("B.Tech Information Technology", 70),
+    ("Diploma in Accounting", 50),
+    ("High school diploma", 50),
+    ("Graduated from high school", 30),
+])
+def test_degree_level_detects_degrees(text, level):
+    assert degree_level(text) == level
+
+
+@pytest.mark.parametrize("text", [
+    "Please contact me. thanks",
+    "Ms. Smith will interview you",
+    "It will be. done",
+    "ba. ",
+    "You will be in charge of the team",
+    "p99 stayed under 200 ms in production",
+    "Join me as a data analyst",
+])
+def test_degree_level_ignores_ordinary_words(text):
+    assert degree_level(text) == 0
+
+
+def test_required_level_not_raised_by_ordinary_words():
+    job = "Data analyst. Requirements: python, sql. Questions? Contact me. Ms. Smith will be. happy to help."
+    resume = "Education\nDiploma in Accounting\nSkills\npython, sql\nExperience\nBuilt sql reports in python"
+    result = score_resume_local(resume, job)
+    assert "the job asks for" not in result['education_reasoning']
@@ -0,0 +1,40 @@
+import asyncio
+
+from modules import cache, llm_handler
+
+
+def test_async_clients_survive_a_new_event_loop(fake_llm, llm_cache):
+    prompt = "Evaluate this resume."
+    first = asyncio.run(llm_handler.aquery_llm("OpenAI", prompt, fake_llm.api_keys, use_cache=False))
+    # A second asyncio.run() closes the first loop; a client bound to it would fail with "Event loop is closed"
+    second = asyncio.run(llm_handler.aquery_llm("OpenAI", prompt, fake_llm.api_keys, use_cache=False))
+    assert first == second and "Final Score" in first
+
+
+def test_async_clients_are_shared_within_a_loop():
+    async def clients():
+        return (llm_handler.get_client("openai", "k", "http://127.0.0.1:1/v1", asynchronous=True),
+                llm_handler.get_client("openai", "k", "http://127.0.0.1:1/v1", asynchronous=True))
+
+    a, b = asyncio.run(clients())
+    c, _ = asyncio.run(clients())
+    assert a is b and a is not c
+
+
+def test_aquery_many_uses_the_cache(fake_llm, llm_cache):
+    prompts = [f"Resume {i}" for i in range(4)]
+    first = asyncio.run(llm_handler.aquery_many("OpenAI", prompts, fake_llm.api_keys))
+    requests = fake_llm.config.requests
+    second = asyncio.run(llm_handler.aquery_many("OpenAI", prompts, fake_llm.api_keys))
+    assert first == second
+    assert fake_llm.config.requests == requests
+
+
+def test_disk_cache_coroutines_round_trip(tmp_path):
+    disk_cache = cache.LLMCache(db_path=str(tmp_path / "llm.sqlite"))
+
+    async def round_trip():
+        await disk_cache.aset("key", "value")
+        return await disk_cache.aget("key"), await disk_cache.aget("missing")
+
+    assert asyncio.run(round_trip()) == ("value", None)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from modules import llm_handler
+
+
+def test_provider_interface_is_abstract():
+    with pytest.raises(TypeError):
+        llm_handler.LLMProvider()
+
+    class Incomplete(llm_handler.LLMProvider):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_default_stream_and_acomplete_use_complete():
+    class Echo(llm_handler.LLMProvider):
+        name = "echo"
+
+        def complete(self, prompt, json_mode=False):
+            return prompt.upper()
+
+    provider = Echo()
+    assert list(provider.stream("hi")) == ["HI"]
+    assert asyncio.run(provider.acomplete("hi")) == "HI"
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+def test_gemini_providers_keep_their_own_keys():
+    pytest.importorskip("google.generativeai")
+    first = llm_handler.GeminiProvider("key-a")
+    second = llm_handler.GeminiProvider("key-b")
+    assert first._model._client._transport._credentials.token == "key-a"
+    assert second._model._client._transport._credentials.token == "key-b"
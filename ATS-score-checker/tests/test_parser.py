@@ -0,0 +1,64 @@
+import pytest
+
+from benchmarks.corpus import make_docx, make_pdf
+from modules import parser
+
+TEXT = "\n".join(f"Line {i} python sql" for i in range(200))  # 4 pages of 50 lines
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    parser.clear_cache()
+    yield
+    parser.clear_cache()
+
+
+def test_docx_text_is_extracted():
+    assert "Line 199 python sql" in parser.extract_bytes("resume.docx", make_docx(TEXT))
+
+
+@pytest.mark.parametrize("timeout", [None, 30])
+def test_pdf_text_is_extracted_with_and_without_timeout(timeout):
+    text = parser.extract_bytes("resume.pdf", make_pdf(TEXT), timeout=timeout)
+    assert "Line 0 python sql" in text and "Line 199 python sql" in text
+
+
+def test_cache_is_keyed_by_max_pages():
+    data = make_pdf(TEXT)
+    first_page = parser.extract_bytes("resume.pdf", data, max_pages=1)
+    all_pages = parser.extract_bytes("resume.pdf", data, max_pages=10)
+    assert "Line 49 python sql" in first_page and "Line 50 python sql" not in first_page
+    assert "Line 199 python sql" in all_pages
+    assert parser.extract_bytes("resume.pdf", data, max_pages=1) == first_page
+
+
+def test_parallel_chunks_keep_page_order():
+    data = make_pdf("\n".join(f"Line {i}" for i in range(50 * parser.PARALLEL_PAGE_THRESHOLD)))
+    lines = [line for line in parser.extract_bytes("resume.pdf", data).splitlines() if line.startswith("Line")]
+    assert lines == [f"Line {i}" for i in range(50 * parser.PARALLEL_PAGE_THRESHOLD)]
+
+
+def test_small_pdf_with_timeout_is_extracted_in_process(monkeypatch):
+    def no_pool():
+        raise AssertionError("small PDFs should not use the process pool")
+
+    monkeypatch.setattr(parser, "_get_pool", no_pool)
+    assert "Line 199 python sql" in parser.extract_bytes("resume.pdf", make_pdf(TEXT), timeout=30)
+    with pytest.raises(parser.ExtractionError, match="timed out"):
+        parser.extract_bytes("resume.pdf", make_pdf(TEXT + "\nother"), timeout=1e-9)
+
+
+def test_overrun_raises_and_recycles_pool(monkeypatch):
+    monkeypatch.setattr(parser, "POOL_PAGE_THRESHOLD", 1)
+    data = make_pdf(TEXT)
+    pool = parser._get_pool()
+    with pytest.raises(parser.ExtractionError, match="timed out"):
+        parser.extract_bytes("resume.pdf", data, timeout=1e-9)
+    assert parser._pool is None and pool not in parser._worker_pids
+    assert "Line 199 python sql" in parser.extract_bytes("resume.pdf", data, timeout=30)
+    assert parser._pool is not None and parser._pool is not pool
+
+
+def test_oversized_file_is_rejected():
+    with pytest.raises(parser.ExtractionError, match="byte limit"):
+        parser.extract_bytes("resume.pdf", b"x" * 11, max_bytes=10)
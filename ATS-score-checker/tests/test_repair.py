@@ -0,0 +1,99 @@
+import json
+import random
+
+import pytest
+
+from benchmarks import fake_llm as fake_llm_module
+from benchmarks.corpus import make_job_description, make_resume_text
+from modules import scorer
+from modules.compaction import estimate_tokens
+from modules.job_profile import get_job_profile
+
+LLM = "OpenAI gpt-3.5-turbo"
+VALID = {'education_score': 70, 'education_reasoning': "Holds a relevant bachelor's degree.", 'skills_score': 80}
+
+
+@pytest.fixture(scope="module")
+def resume_and_profile():
+    rng = random.Random(0)
+    return make_resume_text(rng), get_job_profile(make_job_description(rng))
+
+
+def test_repair_prompt_is_a_fraction_of_the_scoring_prompt(resume_and_profile):
+    resume_text, profile = resume_and_profile
+    scoring = scorer.build_scoring_prompt(resume_text, profile, structured=True)
+    repair = scorer.build_repair_prompt(resume_text, profile, VALID, ['experience_score', 'skills_suggestions'])
+    assert estimate_tokens(repair) < estimate_tokens(scoring) / 2
+    assert "ONLY these keys: experience_score, skills_suggestions." in repair
+
+
+def test_repair_prompt_sends_only_the_sections_asked_about(resume_and_profile):
+    resume_text, profile = resume_and_profile
+    repair = scorer.build_repair_prompt(resume_text, profile, VALID, ['skills_reasoning'])
+    assert "Resume skills:" in repair
+    assert "Resume experience:" not in repair and "Resume education:" not in repair
+    # Only scores of the earlier answer are repeated, not its free text
+    assert '"skills_score": 80' in repair and VALID['education_reasoning'] not in repair
+    assert "Resume" not in scorer.build_repair_prompt(resume_text, profile, VALID, ['overall_explanation']).split("requirements:")[1]
+
+
+def test_validate_response_coerces_and_lists_invalid_fields():
+    valid, invalid = scorer.validate_response({
+        'education_score': "85", 'skills_score': 101, 'experience_score': True, 'final_score': 79.6,
+        'education_reasoning': "  Strong degree. ", 'skills_reasoning': "", 'overall_explanation': 42,
+    })
+    assert valid == {'education_score': 85, 'final_score': 80, 'education_reasoning': "Strong degree."}
+    assert set(invalid) == set(scorer.RESPONSE_FIELDS.values()) - set(valid)
+
+
+def test_malformed_answer_is_repaired_with_a_follow_up(resume_and_profile, fake_llm, llm_cache):
+    resume_text, profile = resume_and_profile
+    fake_llm.config.malformed_rate = 1.0  # the answer lacks skills_reasoning and has experience_score "n/a"
+    result = scorer.score_resume(resume_text, profile, LLM, fake_llm.api_keys)
+    assert fake_llm.config.requests == 2
+    assert not result['error']
+    assert result['skills_reasoning'] and isinstance(result['experience_score'], int)
+    assert abs(result['final_score'] - scorer.weighted_final_score(result)) <= scorer.FINAL_SCORE_TOLERANCE
+    assert "[DEBUG" not in result['overall_explanation']
+
+
+def test_repair_fields_returns_only_valid_requested_fields(resume_and_profile, fake_llm, llm_cache, monkeypatch):
+    resume_text, profile = resume_and_profile
+    monkeypatch.setattr(fake_llm_module, "render_answer",
+                        lambda *args: '{"skills_reasoning": "Good.", "experience_score": "lots", "education_score": 1}')
+    repaired = scorer.repair_fields(resume_text, profile, VALID, ['skills_reasoning', 'experience_score'], LLM,
+                                    fake_llm.api_keys)
+    assert repaired == {'skills_reasoning': "Good."}
+
+
+def test_failed_repair_keeps_the_valid_fields_and_reports_the_missing_score(resume_and_profile, fake_llm, llm_cache, monkeypatch):
+    resume_text, profile = resume_and_profile
+    fake_llm.config.malformed_rate = 1.0
+    render_answer = fake_llm_module.render_answer
+    monkeypatch.setattr(fake_llm_module, "render_answer",
+                        lambda prompt, *args: "Sorry." if "ONLY these keys" in prompt else render_answer(prompt, *args))
+    result = scorer.score_resume(resume_text, profile, LLM, fake_llm.api_keys)
+    assert fake_llm.config.requests == 2
+    assert result['education_score'] > 0 and result['skills_reasoning'] == ''
+    assert "missing experience_score" in result['overall_explanation']
+    assert result['error'] == "LLM gave no valid experience_score"
+
+
+def test_missing_text_field_alone_is_not_a_failure(resume_and_profile, fake_llm, llm_cache, monkeypatch):
+    resume_text, profile = resume_and_profile
+    answer = {field: "Text." for field in scorer.RESPONSE_FIELDS.values()}
+    answer.update(education_score=80, skills_score=80, experience_score=80, final_score=80, skills_reasoning="")
+    monkeypatch.setattr(fake_llm_module, "render_answer",
+                        lambda prompt, *args: "{}" if "ONLY these keys" in prompt else json.dumps(answer))
+    result = scorer.score_resume(resume_text, profile, LLM, fake_llm.api_keys)
+    assert not result['error'] and result['final_score'] == 80
+
+
+def test_final_score_is_recomputed_when_it_disagrees(resume_and_profile, fake_llm, llm_cache, monkeypatch):
+    resume_text, profile = resume_and_profile
+    answer = {field: "Text." for field in scorer.RESPONSE_FIELDS.values()}
+    answer.update(education_score=80, skills_score=80, experience_score=80, final_score=10)
+    monkeypatch.setattr(fake_llm_module, "render_answer", lambda *args: json.dumps(answer))
+    result = scorer.score_resume(resume_text, profile, LLM, fake_llm.api_keys)
+    assert result['final_score'] == 80 and "the model reported 10" in result['overall_explanation']
+    assert fake_llm.config.requests == 1
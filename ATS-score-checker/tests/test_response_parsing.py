@@ -0,0 +1,60 @@
+import pytest
+
+from benchmarks.fake_llm import fake_scores
+from modules import llm_handler, scorer
+
+LLM = "OpenAI gpt-3.5-turbo"
+RESPONSE = """Education Score: 80
+Education Reasoning: Relevant degree.
+Skills Score: 72.6
+Skills Reasoning: Knows python: and sql.
+Experience Score: 65/100
+Final Score: 71
+Overall Explanation: Solid match."""
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Education Score: 80", ("education_score", 80)),
+    ("  skills score : 72.6 ", ("skills_score", 73)),
+    ("Experience Score: 65/100", ("experience_score", 65)),
+    ("FinalScore: 71", ("final_score", 71)),
+    ("Skills Reasoning: Knows python: and sql.", ("skills_reasoning", "Knows python: and sql.")),
+])
+def test_parse_response_line(line, expected):
+    assert scorer.parse_response_line(line) == expected
+
+
+@pytest.mark.parametrize("line", [
+    "", "Here is the evaluation:", "Skills Score: 120", "Skills Score: n/a", "Education Reasoning:   ", "Score: 80",
+])
+def test_parse_response_line_rejects(line):
+    assert scorer.parse_response_line(line) is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_iter_response_fields_matches_whole_response(chunk_size):
+    chunks = [RESPONSE[i:i + chunk_size] for i in range(0, len(RESPONSE), chunk_size)]
+    fields = list(scorer.iter_response_fields(chunks))
+    assert fields == [parsed for parsed in map(scorer.parse_response_line, RESPONSE.splitlines()) if parsed]
+    assert dict(fields)["overall_explanation"] == "Solid match."  # last line, no trailing newline
+
+
+def test_iter_response_fields_yields_each_line_once_complete():
+    seen = []
+    chunks = iter(["Education Score: 8", "0\nSkills", " Score: 70\n"])
+
+    def recording():
+        for chunk in chunks:
+            seen.append(chunk)
+            yield chunk
+
+    fields = scorer.iter_response_fields(recording())
+    assert next(fields) == ("education_score", 80) and len(seen) == 2
+    assert next(fields) == ("skills_score", 70) and len(seen) == 3
+
+
+def test_streamed_answer_from_fake_llm_parses_completely(fake_llm, llm_cache):
+    stream = llm_handler.query_llm(LLM, "Resume: python, sql", fake_llm.api_keys, use_cache=False, stream=True)
+    fields = dict(scorer.iter_response_fields(stream))
+    expected, _ = scorer.validate_response(fake_scores("Resume: python, sql", malformed=False))
+    assert fields == expected
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from modules.router import LLMRouter
+
+
+class FakeProvider:
+    """Answers with its name after `delay` seconds; failures is a script of upcoming calls that raise."""
+    def __init__(self, name, delay=0.0, failures=()):
+        self.name = name
+        self.delay = delay
+        self.failures = list(failures)
+        self.calls = 0
+
+    def complete(self, prompt, **options):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failures and self.failures.pop(0):
+            raise ConnectionError(f"{self.name} is down")
+        return self.name
+
+
+def test_unmeasured_providers_are_tried_then_the_fastest_wins():
+    slow, fast = FakeProvider("slow", 0.02), FakeProvider("fast", 0.001)
+    router = LLMRouter([slow, fast], min_samples=2)
+    answers = [router.complete("prompt") for _ in range(8)]
+    assert slow.calls == 2 and fast.calls == 6  # each measured min_samples times before ranking by p50
+    assert answers[-4:] == ["fast"] * 4
+    assert [p.name for p in router.ranked()] == ["fast", "slow"]
+
+
+def test_failing_provider_fails_over_and_is_demoted():
+    flaky, steady = FakeProvider("flaky", failures=[True] * 3), FakeProvider("steady", 0.01)
+    router = LLMRouter([flaky, steady], min_samples=3, probe_interval=60)
+    assert [router.complete("prompt") for _ in range(3)] == ["steady"] * 3
+    assert not router.is_healthy(flaky)
+    assert [p.name for p in router.ranked()] == ["steady", "flaky"]
+    router.complete("prompt")
+    assert flaky.calls == 3
+
+
+def test_all_providers_failing_raises_the_last_error():
+    router = LLMRouter([FakeProvider("a", failures=[True]), FakeProvider("b", failures=[True])])
+    with pytest.raises(ConnectionError, match="b is down"):
+        router.complete("prompt")
+
+
+def test_hedge_fires_after_the_primary_p95():
+    primary, backup = FakeProvider("primary", 0.01), FakeProvider("backup", 0.03)
+    router = LLMRouter([primary, backup], hedge=True, min_samples=1)
+    for _ in range(5):
+        router.complete("prompt")
+    assert [p.name for p in router.ranked()] == ["primary", "backup"] and router.stats["primary"].p95 < 0.05
+    primary_calls = primary.calls
+    primary.delay = 1.0
+    start = time.monotonic()
+    assert router.complete("prompt") == "backup"
+    assert time.monotonic() - start < 0.5
+    assert primary.calls == primary_calls + 1
+
+
+def test_hedge_is_not_sent_when_the_primary_answers_within_p95():
+    primary, backup = FakeProvider("primary", 0.05), FakeProvider("backup", 0.08)
+    router = LLMRouter([primary, backup], hedge=True, min_samples=1)
+    router.complete("prompt")
+    router.complete("prompt")
+    backup_calls = backup.calls
+    primary.delay = 0.0
+    assert router.complete("prompt") == "primary"
+    assert backup.calls == backup_calls
+
+
+def test_unhealthy_provider_is_probed_after_the_interval_and_recovers():
+    fast = FakeProvider("fast", 0.001, failures=[True] * 3)
+    slow = FakeProvider("slow", 0.02)
+    router = LLMRouter([fast, slow], min_samples=3, probe_interval=0.1)
+    for _ in range(3):
+        assert router.complete("prompt") == "slow"
+    assert not router.is_healthy(fast)
+    assert router.complete("prompt") == "slow" and fast.calls == 3  # still cooling down
+    time.sleep(0.15)
+    assert router.complete("prompt") == "fast"  # the probe succeeds
+    assert router.is_healthy(fast)
+    assert [router.complete("prompt") for _ in range(3)] == ["fast"] * 3
+
+
+def test_failed_probe_waits_for_the_next_interval():
+    down = FakeProvider("down", failures=[True] * 10)
+    up = FakeProvider("up", 0.001)
+    router = LLMRouter([down, up], min_samples=1, probe_interval=0.1)
+    router.complete("prompt")
+    time.sleep(0.15)
+    assert router.complete("prompt") == "up" and down.calls == 2  # one failed probe, then failover
+    for _ in range(5):
+        router.complete("prompt")
+    assert down.calls == 2
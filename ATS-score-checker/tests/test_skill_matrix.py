@@ -0,0 +1,53 @@
+import random
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import make_job_description, make_resume_text
+from modules.job_profile import SKILL_INDEX, get_job_profile
+from modules.skill_matrix import SkillMatrix, SkillVocabulary
+from modules.utils import match_skills
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(3)
+    resumes = [make_resume_text(rng, n_skills=rng.randint(0, 15), skill_density=rng.random() * 0.3) for _ in range(25)]
+    # Include a JD without whitelisted skills and a resume listing free-form skills
+    jobs = [get_job_profile(make_job_description(rng, n_skills=n)) for n in (1, 4, 8, 12)]
+    jobs.append(get_job_profile("We are hiring a friendly colleague."))
+    resumes.append("Skills: python, Underwater Basket Weaving, sql\nExperience\nWeaver 2019")
+    matrix = SkillMatrix()
+    for i, text in enumerate(resumes):
+        matrix.add_resume(i, text)
+    for j, profile in enumerate(jobs):
+        matrix.add_job(j, profile)
+    return resumes, jobs, matrix
+
+
+def test_vocabulary_ids_follow_skill_index():
+    vocabulary = SkillVocabulary()
+    assert all(vocabulary.intern(skill) == i for skill, i in SKILL_INDEX.items())
+    new_id = vocabulary.intern("underwater basket weaving")
+    assert new_id == len(SKILL_INDEX) and vocabulary.skill(new_id) == "underwater basket weaving"
+
+
+def test_matched_and_missing_agree_with_match_skills(corpus):
+    resumes, jobs, matrix = corpus
+    coverage, missing = matrix.coverage(), matrix.missing_counts()
+    for i, text in enumerate(resumes):
+        for j, profile in enumerate(jobs):
+            _, _, expected_matched, expected_missing = match_skills(profile, text)
+            assert matrix.matched_missing(i, j) == (expected_matched, expected_missing)
+            assert coverage[i, j] == len(expected_matched) and missing[i, j] == len(expected_missing)
+
+
+def test_top_k_agrees_with_match_skills(corpus):
+    resumes, jobs, matrix = corpus
+    top = matrix.top_k(5)
+    for j, profile in enumerate(jobs):
+        counts = [len(match_skills(profile, text)[2]) for text in resumes]
+        expected = list(np.argsort(-np.array(counts), kind='stable')[:5])
+        assert [entry['resume_id'] for entry in top[j]] == expected
+        assert [entry['matched'] for entry in top[j]] == [counts[i] for i in expected]
+    assert np.all(matrix.coverage_ratio()[:, -1] == 1.0)
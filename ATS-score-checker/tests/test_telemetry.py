@@ -0,0 +1,82 @@
+import logging
+import threading
+
+import pytest
+
+from modules import batch, telemetry
+
+
+@pytest.fixture(autouse=True)
+def disabled_exports(monkeypatch):
+    monkeypatch.setattr(telemetry, "_enabled", False)
+
+
+def _stages(run_stats):
+    return {stage["stage"]: stage["calls"] for stage in run_stats.summary()["stages"]}
+
+
+def test_nothing_is_recorded_without_a_run():
+    assert telemetry.start_run() is None
+    assert telemetry.span("stage") is telemetry._NOOP_SPAN
+
+
+def test_runs_are_isolated_per_thread():
+    barrier = threading.Barrier(2)
+    runs = {}
+
+    def session(name, calls):
+        with telemetry.run(record=True) as run_stats:
+            barrier.wait()
+            for _ in range(calls):
+                with telemetry.span(name):
+                    pass
+            telemetry.count("resumes", calls)
+        runs[name] = run_stats
+
+    threads = [threading.Thread(target=session, args=(name, calls)) for name, calls in (("a", 2), ("b", 3))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _stages(runs["a"]) == {"a": 2}
+    assert _stages(runs["b"]) == {"b": 3}
+    assert runs["b"].summary()["counters"] == {"resumes": 3}
+
+
+def test_ended_run_stops_recording():
+    with telemetry.run(record=True) as run_stats:
+        with telemetry.span("inside"):
+            pass
+    with telemetry.span("after"):
+        pass
+    assert _stages(run_stats) == {"inside": 1}
+    assert telemetry.last_run()["stages"][0]["stage"] == "inside"
+
+
+def test_worker_thread_spans_join_the_callers_run():
+    def work(item):
+        with telemetry.span("worker"):
+            return item
+
+    with telemetry.run(record=True) as run_stats:
+        assert sorted(batch.bounded_map(work, range(5), max_workers=3)) == list(range(5))
+    assert _stages(run_stats) == {"worker": 5}
+
+
+def test_configure_is_idempotent(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "_log_handler", None)
+    monkeypatch.setattr(telemetry, "_log_path", None)
+    before = list(telemetry.logger.handlers)
+    try:
+        for _ in range(3):
+            telemetry.configure(log_path=str(tmp_path / "a.log"))
+        assert len(telemetry.logger.handlers) == len(before) + 1
+        telemetry.configure(log_path=str(tmp_path / "b.log"))
+        added = [h for h in telemetry.logger.handlers if h not in before]
+        assert [h.baseFilename for h in added] == [str(tmp_path / "b.log")]
+    finally:
+        for handler in telemetry.logger.handlers[:]:
+            if handler not in before:
+                telemetry.logger.removeHandler(handler)
+                handler.close()
+        telemetry.logger.setLevel(logging.NOTSET)